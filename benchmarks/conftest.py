@@ -0,0 +1,117 @@
+"""Kraken payloads and local transports for the benchmark suite.
+
+Payloads follow the shape of recorded Kraken responses at production
+sizes: 720 one-minute candles per OHLC page and every tradable pair for
+the ticker and asset pair endpoints.
+"""
+import json
+import random
+from typing import Any
+from typing import Iterator
+
+import httpx
+import pytest
+
+from okapi.api.market import MarketRESTAPI
+from okapi.client import Client
+
+
+PAIRS = 600
+CANDLES = 720
+START = 1650000000
+
+
+def _price(rng: random.Random) -> str:
+    return f"{rng.uniform(0.001, 50000):.5f}"
+
+
+def ohlc_payload() -> dict[str, Any]:
+    """Build an OHLC page of 720 candles."""
+    rng = random.Random(0)
+    rows = [
+        [
+            START + 60 * i,
+            *(_price(rng) for _ in range(5)),
+            f"{rng.uniform(0, 100):.8f}",
+            rng.randint(0, 500),
+        ]
+        for i in range(CANDLES)
+    ]
+    return {"XXBTZUSD": rows, "last": rows[-2][0]}
+
+
+def ticker_payload() -> dict[str, Any]:
+    """Build a ticker payload for every pair."""
+    rng = random.Random(1)
+    return {
+        f"PAIR{i:04d}": {
+            "a": [_price(rng), "1", "1.000"],
+            "b": [_price(rng), "2", "2.000"],
+            "c": [_price(rng), "0.01000000"],
+            "v": [_price(rng), _price(rng)],
+            "p": [_price(rng), _price(rng)],
+            "t": [rng.randint(0, 5000), rng.randint(0, 50000)],
+            "l": [_price(rng), _price(rng)],
+            "h": [_price(rng), _price(rng)],
+            "o": _price(rng),
+        }
+        for i in range(PAIRS)
+    }
+
+
+def asset_pairs_payload() -> dict[str, Any]:
+    """Build an asset pairs payload for every pair."""
+    fees = [
+        [volume, 0.26 - 0.02 * i]
+        for i, volume in enumerate((0, 50000, 100000, 250000, 500000))
+    ]
+    return {
+        f"PAIR{i:04d}": {
+            "altname": f"PAIR{i:04d}",
+            "wsname": f"PA/IR{i:04d}",
+            "aclass_base": "currency",
+            "base": "XXBT",
+            "aclass_quote": "currency",
+            "quote": "ZUSD",
+            "lot": "unit",
+            "pair_decimals": 1,
+            "lot_decimals": 8,
+            "lot_multiplier": 1,
+            "leverage_buy": [2, 3, 4, 5],
+            "leverage_sell": [2, 3, 4, 5],
+            "fees": fees,
+            "fees_maker": fees,
+            "fee_volume_currency": "ZUSD",
+            "margin_call": 80,
+            "margin_stop": 40,
+            "ordermin": "0.0001",
+        }
+        for i in range(PAIRS)
+    }
+
+
+PAYLOADS = {
+    "/0/public/OHLC": ohlc_payload(),
+    "/0/public/Ticker": ticker_payload(),
+    "/0/public/AssetPairs": asset_pairs_payload(),
+}
+BODIES = {
+    path: json.dumps({"error": [], "result": result}).encode()
+    for path, result in PAYLOADS.items()
+}
+
+
+def kraken_handler(request: httpx.Request) -> httpx.Response:
+    """Serve the payloads from memory."""
+    return httpx.Response(
+        200,
+        content=BODIES[request.url.path],
+        headers={"Content-Type": "application/json"},
+    )
+
+
+@pytest.fixture(name="market")
+def mock_market() -> Iterator[MarketRESTAPI]:
+    """Fixture for a market API served by a local transport."""
+    with Client(transport=httpx.MockTransport(kraken_handler)) as client:
+        yield MarketRESTAPI(client)
@@ -0,0 +1,37 @@
+"""Benchmarks for the Kraken authentication."""
+import base64
+from typing import Any
+
+import httpx
+import pytest
+
+from okapi.api.utils import nonce_data
+from okapi.auth import KrakenAuth
+
+
+SECRET = base64.b64encode(bytes(range(64))).decode()
+
+
+def private_request(fields: int, *, extensions: bool) -> httpx.Request:
+    """Build a private request whose body has the given number of fields."""
+    data = nonce_data({f"field{i}": "x" * 16 for i in range(fields)})
+    return httpx.Request(
+        "POST",
+        "https://api.kraken.com/0/private/AddOrder",
+        data=data,
+        extensions={"nonce": data["nonce"]} if extensions else {},
+    )
+
+
+@pytest.mark.parametrize("fields", [0, 10, 100])
+def test_sign_request(benchmark: Any, fields: int) -> None:
+    """Sign a private request carrying its nonce in the extensions."""
+    auth = KrakenAuth(key="key", secret=SECRET)
+    benchmark(auth.sign_request, private_request(fields, extensions=True))
+
+
+@pytest.mark.parametrize("fields", [0, 10, 100])
+def test_sign_request_parsing_body(benchmark: Any, fields: int) -> None:
+    """Sign a private request whose nonce has to be parsed from the body."""
+    auth = KrakenAuth(key="key", secret=SECRET)
+    benchmark(auth.sign_request, private_request(fields, extensions=False))
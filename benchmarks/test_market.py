@@ -0,0 +1,68 @@
+"""Benchmarks for the public market API."""
+from typing import Any
+
+import httpx
+import pandas as pd
+
+from .conftest import BODIES
+from .conftest import PAYLOADS
+from okapi.api.market import _decode_ohlc
+from okapi.api.market import _format_ohlc
+from okapi.api.market import CompactOHLC
+from okapi.api.market import MarketRESTAPI
+from okapi.api.market import OHLC_COLUMNS
+from okapi.api.utils import content
+
+
+def test_content(benchmark: Any) -> None:
+    """Decode and check an all-pairs ticker response."""
+    body = BODIES["/0/public/Ticker"]
+    request = httpx.Request("GET", "https://api.kraken.com/0/public/Ticker")
+
+    def decode() -> dict[str, Any]:
+        return content(httpx.Response(200, content=body, request=request))
+
+    benchmark(decode)
+
+
+def test_decode_ohlc(benchmark: Any) -> None:
+    """Decode a page of 720 candles into typed columns."""
+    response = httpx.Response(200, content=BODIES["/0/public/OHLC"])
+    benchmark(_decode_ohlc, response)
+
+
+def test_format_ohlc(benchmark: Any) -> None:
+    """Format a page of 720 candles."""
+    rows = PAYLOADS["/0/public/OHLC"]["XXBTZUSD"]
+
+    def setup() -> tuple[tuple[pd.DataFrame], dict[str, int]]:
+        return (pd.DataFrame(rows, columns=OHLC_COLUMNS),), {"interval": 1}
+
+    benchmark.pedantic(_format_ohlc, setup=setup, rounds=100)
+
+
+def test_ohlc_data(benchmark: Any, market: MarketRESTAPI) -> None:
+    """Request and parse a page of 720 candles."""
+    benchmark(market.ohlc_data, "XBTUSD")
+
+
+def test_ohlc_data_compact(benchmark: Any, market: MarketRESTAPI) -> None:
+    """Request and parse a page of 720 candles into a compact frame."""
+    benchmark(market.ohlc_data, "XBTUSD", compact=CompactOHLC())
+
+
+def test_ticker_information(benchmark: Any, market: MarketRESTAPI) -> None:
+    """Request and parse the ticker of every pair."""
+    benchmark(market.ticker_information, "XBTUSD")
+
+
+def test_ticker_information_columnar(
+    benchmark: Any, market: MarketRESTAPI
+) -> None:
+    """Request and parse the ticker of every pair into flat columns."""
+    benchmark(market.ticker_information, "XBTUSD", columnar=True)
+
+
+def test_tradable_asset_pairs(benchmark: Any, market: MarketRESTAPI) -> None:
+    """Request and parse every tradable asset pair."""
+    benchmark(market.tradable_asset_pairs, "XBTUSD")
@@ -0,0 +1,67 @@
+"""Per-request overhead of the typeguard runtime checks.
+
+Run with ``python benchmarks/typecheck.py``. Each mode runs in a fresh
+interpreter because ``OKAPI_TYPECHECK`` is read when okapi is imported.
+"""
+import os
+import subprocess  # nosec
+import sys
+from textwrap import dedent
+
+
+STATEMENT = dedent(
+    """\
+    import sys
+    import timeit
+
+    import httpx
+
+    from okapi.api.market import MarketRESTAPI
+    from okapi.client import Client
+
+    rows = [
+        [1650000000 + 60 * i, "40000.0", "40010.0", "39990.0", "40005.0",
+         "40002.0", "1.25", 10]
+        for i in range(720)
+    ]
+    payload = {"error": [], "result": {"XXBTZUSD": rows, "last": 0}}
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, json=payload)
+    )
+    market = MarketRESTAPI(Client(transport=transport))
+    number = int(sys.argv[1])
+    seconds = min(
+        timeit.repeat(
+            "market.ohlc_data('XBTUSD')", number=number, repeat=5,
+            globals=globals(),
+        )
+    )
+    print(f"{seconds / number * 1e6:.1f}")
+    """
+)
+
+
+def run(enabled: bool, number: int = 50) -> float:
+    """Return the time per OHLC request in microseconds."""
+    env = {**os.environ, "OKAPI_TYPECHECK": "1" if enabled else "0"}
+    output = subprocess.run(  # noqa: S603  # nosec
+        [sys.executable, "-c", STATEMENT, str(number)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output)
+
+
+def main() -> None:
+    """Print the per-request time with checks on and off."""
+    enabled = run(True)
+    disabled = run(False)
+    print(f"typecheck on:  {enabled:10.1f} us/request")
+    print(f"typecheck off: {disabled:10.1f} us/request")
+    print(f"overhead:      {enabled - disabled:10.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -166,6 +166,19 @@ def typeguard(session: Session) -> None:
     session.run("pytest", f"--typeguard-packages={PACKAGE}", *session.posargs)
 
 
+@nox_session(python=PYTHON_VERSIONS)
+def benchmarks(session: Session) -> None:
+    """Run the benchmark suite and compare it with the previous run.
+
+    Results are saved under .benchmarks/, which is not versioned: runs can
+    only be compared with earlier ones made on the same machine.
+    """
+    args = session.posargs or ["--benchmark-autosave", "--benchmark-compare"]
+    session.install(".")
+    session.install("pytest", "pytest-benchmark")
+    session.run("pytest", "benchmarks", *args)
+
+
 @nox_session(python=PYTHON_VERSIONS)
 def xdoctest(session: Session) -> None:
     """Run examples with xdoctest."""
@@ -11,13 +11,69 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Command-line interface."""
+"""Command-line interface.
+
+pandas and NumPy are only imported by the commands printing tables, so
+that the others start quickly. These commands print the pandas
+representation of the result by default, ``--format`` streams it as csv,
+ndjson, parquet or arrow to the standard output or to ``--output``.
+"""
+from collections.abc import Iterable
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+
 import click
-import pandas as pd
-from typeguard import typechecked
 
-from .api.kraken import KrakenRESTAPI
+from .api.status import _parse_server_time
+from .api.status import _parse_system_status
+from .api.utils import content
+from .api.utils import public_url
 from .client import Client
+from .output import DataFrame
+from .output import FORMATS
+from .output import FrameWriter
+from .typecheck import typechecked
+
+
+@typechecked
+def _market(client: Client) -> Any:
+    """Public API of the client, which needs pandas and NumPy."""
+    from .api.market import (  # pylint: disable=import-outside-toplevel
+        MarketRESTAPI,
+    )
+
+    return MarketRESTAPI(client)
+
+
+@typechecked
+def _output_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Add the ``--format`` and ``--output`` options to a command."""
+    command = click.option(
+        "-o", "--output", type=click.File("wb"), default="-"
+    )(command)
+    return click.option(
+        "-f",
+        "--format",
+        "fmt",
+        type=click.Choice(FORMATS),
+        default="text",
+        show_default=True,
+    )(command)
+
+
+@typechecked
+def _echo(message: Any, output: BinaryIO) -> None:
+    """Print a message on a binary output."""
+    click.echo(str(message).encode(), file=output)
+
+
+@typechecked
+def _write(frames: Iterable[DataFrame], fmt: str, output: BinaryIO) -> None:
+    """Write frames one after the other in the given format."""
+    with FrameWriter(output, fmt) as writer:
+        for frame in frames:
+            writer.write(frame)
 
 
 @click.group()
@@ -36,8 +92,7 @@ def main(ctx, key: str | None, secret: str | None) -> None:
 @typechecked
 def server_time(client: Client) -> None:
     """Get the server's time."""
-    kapi = KrakenRESTAPI(client)
-    response = kapi.market.server_time()
+    response = _parse_server_time(client.get(url=public_url("Time")))
     click.echo(response)
 
 
@@ -46,8 +101,7 @@ def server_time(client: Client) -> None:
 @typechecked
 def system_status(client: Client) -> None:
     """Get the current system status or trading mode."""
-    kapi = KrakenRESTAPI(client)
-    response = kapi.market.system_status()
+    response = _parse_system_status(client.get(url=public_url("SystemStatus")))
     click.echo(response)
 
 
@@ -58,53 +112,189 @@ def system_status(client: Client) -> None:
 @typechecked
 def asset_info(client: Client, asset: str | None, aclass: str) -> None:
     """Get the current system status or trading mode."""
-    kapi = KrakenRESTAPI(client)
-    response = kapi.market.asset_info(asset=asset, aclass=aclass)
+    response = _market(client).asset_info(asset=asset, aclass=aclass)
     click.echo(response)
 
 
 @main.command()
 @click.option("-p", "--pair", type=str, default="XBTUSD")
 @click.option("--info", type=str, default="info")
+@_output_options
 @click.pass_obj
 @typechecked
-def tradable_asset_pairs(client: Client, pair: str, info: str) -> None:
+def tradable_asset_pairs(
+    client: Client, pair: str, info: str, fmt: str, output: BinaryIO
+) -> None:
     """Get the current system status or trading mode."""
-    kapi = KrakenRESTAPI(client)
-    response = kapi.market.tradable_asset_pairs(pair=pair, info=info)
-    click.echo(response.T)
+    response = _market(client).tradable_asset_pairs(pair=pair, info=info)
+    if fmt == "text":
+        _echo(response.T, output)
+        return
+
+    _write([response.rename_axis("pair").reset_index()], fmt, output)
 
 
 @main.command()
 @click.option("-p", "--pair", type=str, default="XBTUSD")
+@_output_options
 @click.pass_obj
 @typechecked
-def ticker_information(client: Client, pair: str) -> None:
+def ticker_information(
+    client: Client, pair: str, fmt: str, output: BinaryIO
+) -> None:
     """Get the current system status or trading mode."""
-    kapi = KrakenRESTAPI(client)
-    response = kapi.market.ticker_information(pair=pair)
-    click.echo(response.T)
+    if fmt == "text":
+        response = _market(client).ticker_information(pair=pair)
+        _echo(response.T, output)
+        return
+
+    response = _market(client).ticker_information(pair=pair, columnar=True)
+    _write([response.rename_axis("pair").reset_index()], fmt, output)
 
 
 @main.command()
 @click.option("-p", "--pair", type=str, default="XBTUSD")
 @click.option("-i", "--interval", type=int, default=1)
 @click.option("-s", "--since", type=int)
+@_output_options
 @click.pass_obj
 @typechecked
 def ohlc_data(
-    client: Client, pair: str, interval: int, since: int | None
+    client: Client,
+    pair: str,
+    interval: int,
+    since: int | None,
+    fmt: str,
+    output: BinaryIO,
 ) -> None:
     """Get the current system status or trading mode."""
-    kapi = KrakenRESTAPI(client)
-    response = kapi.market.ohlc_data(pair=pair, interval=interval, since=since)
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    response = _market(client).ohlc_data(
+        pair=pair, interval=interval, since=since
+    )
     last = response.pop("last")
+    if fmt != "text":
+        _write(
+            (
+                ohlc.reset_index().assign(pair=current_pair)
+                for current_pair, ohlc in response.items()
+            ),
+            fmt,
+            output,
+        )
+        return
+
     pd.set_option("display.max_rows", None)
     for current_pair, current_ohlc in response.items():
-        click.echo(f"pair: {current_pair}")
-        click.echo(current_ohlc)
+        _echo(f"pair: {current_pair}", output)
+        _echo(current_ohlc, output)
+
+    _echo(f"last: {last}", output)
+
+
+@main.command()
+@click.option("-p", "--pair", type=str, default="XBTUSD")
+@click.option("-s", "--since", type=int, help="Cursor, in nanoseconds.")
+@click.option("-u", "--until", type=float, help="Trade time, in seconds.")
+@_output_options
+@click.pass_obj
+@typechecked
+def recent_trades(
+    client: Client,
+    pair: str,
+    since: int | None,
+    until: float | None,
+    fmt: str,
+    output: BinaryIO,
+) -> None:
+    """Stream the trades of a pair, page after page."""
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    from .api.history import (  # pylint: disable=import-outside-toplevel
+        TradeStream,
+    )
+
+    stream = TradeStream(_market(client), pair, since=since, until=until)
+    _write((pd.DataFrame(chunk) for chunk in stream), fmt, output)
+
+
+@main.command()
+@click.option(
+    "-r",
+    "--root",
+    type=click.Path(file_okay=False),
+    required=True,
+    help="Directory of the candle store.",
+)
+@click.option(
+    "-p",
+    "--pair",
+    "pairs",
+    type=str,
+    multiple=True,
+    help="Pair to collect, all of them when not given.",
+)
+@click.option(
+    "-i",
+    "--interval",
+    "intervals",
+    type=int,
+    multiple=True,
+    default=(1,),
+    show_default=True,
+)
+@click.option("-w", "--workers", type=int, default=1, show_default=True)
+@click.option("-c", "--concurrency", type=int, default=4, show_default=True)
+@click.option(
+    "--rate",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Public calls per second, shared by the workers.",
+)
+@click.option(
+    "--delay",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Seconds to wait after an interval closes.",
+)
+@click.option("--port", type=int, help="Serve /health and /metrics.")
+@click.pass_obj
+@typechecked
+def collect(
+    client: Client,
+    root: str,
+    pairs: tuple[str, ...],
+    intervals: tuple[int, ...],
+    workers: int,
+    concurrency: int,
+    rate: float,
+    delay: float,
+    port: int | None,
+) -> None:
+    """Collect the candles of many pairs into a store, until interrupted."""
+    from .collector import (  # pylint: disable=import-outside-toplevel
+        collect_sharded,
+    )
+
+    if not pairs:
+        pairs = tuple(content(client.get(url=public_url("AssetPairs"))))
 
-    click.echo(f"last: {last}")
+    try:
+        collect_sharded(
+            root,
+            pairs,
+            intervals,
+            workers=workers,
+            rate=rate,
+            port=port,
+            concurrency=concurrency,
+            delay=delay,
+        )
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Kraken order book and spread snapshots."""
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ..typecheck import typechecked
+
+
+BOOK_DTYPE = np.dtype(
+    [("price", np.float64), ("volume", np.float64), ("timestamp", np.int64)]
+)
+SPREAD_DTYPE = np.dtype(
+    [("time", np.int64), ("bid", np.float64), ("ask", np.float64)]
+)
+
+
+Records = npt.NDArray[np.void]
+
+
+@typechecked
+def _records(rows: list[list[Any]], dtype: np.dtype[np.void]) -> Records:
+    """Convert rows of Kraken strings to a contiguous structured array."""
+    names = dtype.names
+    assert names is not None  # noqa: S101  # nosec
+    table = np.array(rows, dtype=np.float64).reshape(-1, len(names))
+    records = np.empty(len(table), dtype=dtype)
+    for i, name in enumerate(names):
+        records[name] = table[:, i]
+
+    return records
+
+
+@typechecked
+@dataclass
+class OrderBookSnapshot:
+    """Order book of a pair.
+
+    ``asks`` are sorted by ascending price and ``bids`` by descending price,
+    both as structured arrays of ``BOOK_DTYPE``.
+    """
+
+    asks: Records
+    bids: Records
+
+    @classmethod
+    def from_levels(
+        cls, asks: list[list[Any]], bids: list[list[Any]]
+    ) -> "OrderBookSnapshot":
+        """Build a snapshot from the levels returned by Kraken."""
+        return cls(_records(asks, BOOK_DTYPE), _records(bids, BOOK_DTYPE))
+
+    def best_ask(self) -> float:
+        """Lowest ask price."""
+        return float(self.asks["price"][0])
+
+    def best_bid(self) -> float:
+        """Highest bid price."""
+        return float(self.bids["price"][0])
+
+    def mid_price(self) -> float:
+        """Average of the best ask and the best bid."""
+        return (self.best_ask() + self.best_bid()) / 2
+
+    def spread(self) -> float:
+        """Difference between the best ask and the best bid."""
+        return self.best_ask() - self.best_bid()
+
+    def cumulative_depth(
+        self, levels: int | None = None
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Cumulative ask and bid volumes over the first ``levels`` levels."""
+        return (
+            np.cumsum(self.asks["volume"][:levels]),
+            np.cumsum(self.bids["volume"][:levels]),
+        )
+
+    def depth_within(self, fraction: float) -> tuple[float, float]:
+        """Ask and bid volumes priced within ``fraction`` of the mid price."""
+        mid = self.mid_price()
+        asks = self.asks["price"] <= mid * (1 + fraction)
+        bids = self.bids["price"] >= mid * (1 - fraction)
+        return (
+            float(self.asks["volume"][asks].sum()),
+            float(self.bids["volume"][bids].sum()),
+        )
+
+
+@typechecked
+def _spreads(rows: list[list[Any]]) -> Records:
+    """Convert spread rows to a structured array of ``SPREAD_DTYPE``."""
+    return _records(rows, SPREAD_DTYPE)
@@ -0,0 +1,115 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Decoding of Kraken responses straight into NumPy arrays."""
+import re
+
+import httpx
+import numpy as np
+
+from ..typecheck import typechecked
+
+_HEAD = re.compile(rb'\s*\{\s*"error"\s*:\s*\[\s*\]\s*,\s*"result"\s*:\s*\{')
+_KEY = re.compile(rb'\s*"([^"]+)"\s*:\s*')
+_EMPTY = re.compile(rb"\[\s*\]")
+_INTEGER = re.compile(rb"\d+")
+_NEXT = re.compile(rb"\s*([,}])")
+_TAIL = re.compile(rb"\s*\}\s*")
+
+
+@typechecked
+def _value(
+    body: bytes, pos: int, key: bytes, width: int
+) -> tuple[np.ndarray | int, int] | None:
+    """Decode the ``last`` cursor or the table of rows found at ``pos``.
+
+    Returns the value and the position after it, or None when it does not
+    have the expected shape.
+    """
+    if key == b"last":
+        match = _INTEGER.match(body, pos)
+        if match is None:
+            return None
+
+        return int(match.group()), match.end()
+
+    match = _EMPTY.match(body, pos)
+    if match is not None:
+        return np.empty((0, width)), match.end()
+
+    if not body.startswith(b"[[", pos):
+        return None
+
+    end = body.find(b"]]", pos) + 2
+    if end == 1:
+        return None
+
+    rows = body.count(b"[", pos, end) - 1
+    text = body[pos:end].translate(None, b'[]" \t\r\n')
+    table = np.fromstring(text, sep=",")
+    if table.size != rows * width:
+        return None
+
+    return table.reshape(-1, width), end
+
+
+@typechecked
+def numeric_tables(
+    response: httpx.Response, width: int
+) -> tuple[dict[str, np.ndarray], int] | None:
+    """Decode rows of numbers per pair straight into float64 tables.
+
+    The result of the response must map pairs to rows of ``width`` numbers
+    or numeric strings, plus the integer ``last`` cursor, as OHLC and
+    Spread do. The body is parsed without building Python objects per
+    value. Returns None when it does not have that shape (errors
+    included): decode it with ``content`` instead.
+    """
+    if not response.is_success:
+        return None
+
+    body = response.content
+    match = _HEAD.match(body)
+    if match is None:
+        return None
+
+    tables = {}
+    last = None
+    pos = match.end()
+    while True:
+        match = _KEY.match(body, pos)
+        if match is None:
+            return None
+
+        decoded = _value(body, match.end(), match.group(1), width)
+        if decoded is None:
+            return None
+
+        value, pos = decoded
+        if isinstance(value, int):
+            last = value
+        else:
+            tables[match.group(1).decode()] = value
+
+        match = _NEXT.match(body, pos)
+        if match is None:
+            return None
+
+        pos = match.end()
+        if match.group(1) == b"}":
+            break
+
+    if last is None or _TAIL.fullmatch(body, pos) is None:
+        return None
+
+    return tables, last
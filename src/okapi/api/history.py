@@ -0,0 +1,350 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Kraken market history backfill and streaming."""
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..typecheck import typechecked
+from .market import _decode_ohlc
+from .market import _trade_columns
+from .market import Columns
+from .market import MarketRESTAPI
+from .market import OHLC_DTYPES
+from .market import Pair
+from .market import TRADE_DTYPES
+from .utils import content
+
+
+@typechecked
+def _ohlc_frame(columns: Columns) -> pd.DataFrame:
+    index = pd.DatetimeIndex(
+        columns["time"].astype("datetime64[s]"), name="dtime"
+    )
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+@typechecked
+class OHLCBuffer:
+    """Growable columnar buffer of OHLC candles sorted by time.
+
+    Pages are copied once into preallocated columns whose capacity doubles
+    when full, so appending ``n`` candles costs ``O(n)`` overall. A candle
+    whose time is already in the buffer replaces the stored one, which
+    deduplicates the candle shared by two consecutive pages.
+    """
+
+    def __init__(self, capacity: int = 720) -> None:
+        self._size = 0
+        self._dirty = 0
+        self._columns = {
+            name: np.empty(max(capacity, 1), dtype=dtype)
+            for name, dtype in OHLC_DTYPES.items()
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """Number of candles the buffer holds before growing."""
+        return len(self._columns["time"])
+
+    @property
+    def last_time(self) -> int | None:
+        """Time of the most recent candle in the buffer."""
+        if self._size == 0:
+            return None
+
+        return int(self._columns["time"][self._size - 1])
+
+    def _reserve(self, size: int) -> None:
+        if size <= self.capacity:
+            return
+
+        capacity = max(size, 2 * self.capacity)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def extend(self, columns: Columns) -> int:
+        """Append candles and return the number of new candles."""
+        time = columns["time"]
+        if len(time) == 0:
+            return 0
+
+        if np.any(np.diff(time) < 0):
+            order = np.argsort(time, kind="stable")
+            columns = {name: column[order] for name, column in columns.items()}
+            time = columns["time"]
+
+        start = self._size
+        first = 0
+        if self._size > 0:
+            first = int(np.searchsorted(time, self.last_time))
+            if first < len(time) and time[first] == self.last_time:
+                start -= 1
+
+        count = len(time) - first
+        if count <= 0:
+            return 0
+
+        self._reserve(start + count)
+        for name, column in self._columns.items():
+            column[start : start + count] = columns[name][first:]
+
+        added = start + count - self._size
+        self._dirty = min(self._dirty, start)
+        self._size = start + count
+        return added
+
+    def columns(self) -> Columns:
+        """Views on the filled part of each column."""
+        return {
+            name: column[: self._size]
+            for name, column in self._columns.items()
+        }
+
+    def dirty(self) -> Columns:
+        """Candles added or replaced since the last call to ``mark_clean``."""
+        return {
+            name: column[self._dirty : self._size]
+            for name, column in self._columns.items()
+        }
+
+    def mark_clean(self) -> None:
+        """Flag every candle as persisted."""
+        self._dirty = self._size
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build a DataFrame indexed by candle time in a single pass."""
+        return _ohlc_frame(
+            {name: column.copy() for name, column in self.columns().items()}
+        )
+
+
+@typechecked
+class OHLCBackfill:
+    """Follow the ``last`` cursor of the OHLC endpoint across pages.
+
+    When ``checkpoint`` is a directory, the candles fetched since the
+    previous checkpoint are written there as a new chunk together with the
+    cursor every ``checkpoint_every`` pages, so an interrupted backfill
+    resumes where it stopped without rewriting what is already on disk.
+    """
+
+    def __init__(
+        self,
+        market: MarketRESTAPI,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        interval: int = 1,
+        since: int | None = None,
+        until: int | None = None,
+        checkpoint: str | Path | None = None,
+        checkpoint_every: int = 1,
+    ) -> None:
+        self.market = market
+        self.pair = pair
+        self.interval = interval
+        self.since = since
+        self.until = until
+        self.checkpoint = None if checkpoint is None else Path(checkpoint)
+        self.checkpoint_every = checkpoint_every
+        self.buffer = OHLCBuffer()
+        self._chunks = 0
+        if self.checkpoint is not None:
+            self._resume()
+
+    def _state_path(self) -> Path:
+        assert self.checkpoint is not None  # noqa: S101  # nosec
+        return self.checkpoint / "state.json"
+
+    def _chunk_path(self, chunk: int) -> Path:
+        assert self.checkpoint is not None  # noqa: S101  # nosec
+        return self.checkpoint / f"chunk-{chunk:06d}.npz"
+
+    def _resume(self) -> None:
+        state_path = self._state_path()
+        if not state_path.exists():
+            return
+
+        state = json.loads(state_path.read_text())
+        if state["interval"] != self.interval:
+            raise ValueError(
+                f"checkpoint interval {state['interval']} does not match "
+                f"{self.interval}."
+            )
+
+        for chunk in range(state["chunks"]):
+            with np.load(self._chunk_path(chunk)) as data:
+                self.buffer.extend({name: data[name] for name in OHLC_DTYPES})
+
+        self.buffer.mark_clean()
+        self.since = state["since"]
+        self._chunks = state["chunks"]
+
+    def save(self) -> None:
+        """Persist the candles fetched since the last checkpoint."""
+        if self.checkpoint is None:
+            return
+
+        self.checkpoint.mkdir(parents=True, exist_ok=True)
+        dirty = self.buffer.dirty()
+        if len(dirty["time"]) > 0:
+            with open(self._chunk_path(self._chunks), "wb") as chunk:
+                np.savez(chunk, **dirty)
+            self._chunks += 1
+            self.buffer.mark_clean()
+
+        state = {
+            "interval": self.interval,
+            "since": self.since,
+            "chunks": self._chunks,
+        }
+        state_path = self._state_path()
+        tmp_path = state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, state_path)
+
+    def _done(self) -> bool:
+        last_time = self.buffer.last_time
+        return (
+            self.until is not None
+            and last_time is not None
+            and last_time >= self.until
+        )
+
+    def pages(self) -> Iterator[Columns]:
+        """Fetch pages until the cursor stops moving and yield each one."""
+        page = 0
+        while not self._done():
+            pairs, last = _decode_ohlc(
+                self.market.ohlc_data(
+                    self.pair,
+                    interval=self.interval,
+                    since=self.since,
+                    raw=True,
+                )
+            )
+            (columns,) = pairs.values()
+            added = self.buffer.extend(columns)
+            advanced = self.since is None or last > self.since
+            self.since = last
+            page += 1
+            if page % self.checkpoint_every == 0:
+                self.save()
+
+            yield columns
+            if added == 0 or not advanced:
+                break
+
+        self.save()
+
+    def run(self) -> pd.DataFrame:
+        """Backfill the whole history and return it as one DataFrame."""
+        for _ in self.pages():
+            pass
+
+        return self.buffer.to_frame()
+
+
+@typechecked
+class TradeStream:
+    """Stream the trades of a pair in fixed-size columnar chunks.
+
+    Pages of the Trades endpoint are followed through their nanosecond
+    ``last`` cursor and copied into chunks of ``chunk_size`` trades, so the
+    whole tick history is processed with bounded memory. Only the last
+    chunk may be shorter. After each chunk, ``since`` is the cursor of the
+    last page entirely delivered: a stream resumed from it may repeat the
+    first trades of a page split across two chunks, never skip one.
+    """
+
+    def __init__(
+        self,
+        market: MarketRESTAPI,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        since: int | None = None,
+        until: float | None = None,
+        chunk_size: int = 65536,
+    ) -> None:
+        self.market = market
+        self.pair = pair
+        self.since = since
+        self.until = until
+        self.chunk_size = chunk_size
+
+    def _chunk(self) -> Columns:
+        return {
+            name: np.empty(self.chunk_size, dtype=dtype)
+            for name, dtype in TRADE_DTYPES.items()
+        }
+
+    def pages(self) -> Iterator[tuple[Columns, int]]:
+        """Yield the trades of each page with the page cursor."""
+        since = self.since
+        while True:
+            response = content(
+                self.market.recent_trades(self.pair, since=since, raw=True)
+            )
+            last = int(response.pop("last"))
+            (rows,) = response.values()
+            if len(rows) == 0 or (since is not None and last <= since):
+                return
+
+            columns = _trade_columns(rows)
+            if self.until is not None and columns["time"][-1] >= self.until:
+                keep = int(np.searchsorted(columns["time"], self.until))
+                yield {
+                    name: column[:keep] for name, column in columns.items()
+                }, last
+                return
+
+            yield columns, last
+            since = last
+
+    def __iter__(self) -> Iterator[Columns]:
+        chunk = self._chunk()
+        size = 0
+        delivered = self.since
+        for columns, last in self.pages():
+            count = len(columns["time"])
+            offset = 0
+            while offset < count:
+                take = min(self.chunk_size - size, count - offset)
+                for name, column in chunk.items():
+                    column[size : size + take] = columns[name][
+                        offset : offset + take
+                    ]
+
+                size += take
+                offset += take
+                if size == self.chunk_size:
+                    self.since = last if offset == count else delivered
+                    yield chunk
+                    chunk = self._chunk()
+                    size = 0
+
+            delivered = last
+
+        if size > 0:
+            self.since = delivered
+            yield {name: column[:size] for name, column in chunk.items()}
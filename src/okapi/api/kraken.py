@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Kraken REST API."""
-from typeguard import typechecked
-
+from ..client import AsyncClient
 from ..client import Client
+from ..typecheck import typechecked
+from .market import AsyncMarketRESTAPI
 from .market import MarketRESTAPI
+from .user import AsyncDataRESTAPI
 from .user import DataRESTAPI
 
 
@@ -26,3 +28,12 @@ class KrakenRESTAPI:  # pylint: disable=too-few-public-methods
     def __init__(self, client: Client) -> None:
         self.market = MarketRESTAPI(client)
         self.user = DataRESTAPI(client)
+
+
+@typechecked
+class AsyncKrakenRESTAPI:  # pylint: disable=too-few-public-methods
+    """Asynchronous Kraken REST API."""
+
+    def __init__(self, client: AsyncClient) -> None:
+        self.market = AsyncMarketRESTAPI(client)
+        self.user = AsyncDataRESTAPI(client)
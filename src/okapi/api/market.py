@@ -12,25 +12,120 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Kraken public API."""
+import asyncio
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
 from typing import Any
-from typing import Iterable
+from typing import Callable
 
 import httpx
 import numpy as np
 import pandas as pd
-from typeguard import typechecked
 
+from ..client import AsyncClient
 from ..client import Client
+from ..metrics import Metrics
+from ..typecheck import typechecked
+from .book import _spreads
+from .book import OrderBookSnapshot
+from .decode import numeric_tables
+from .status import _parse_server_time
+from .status import _parse_system_status
 from .utils import content
 from .utils import public_url
 
 Pair = list[tuple[str, str]] | tuple[str, str] | list[str] | str
+Since = int | dict[str, int] | None
+
+
+TICKER_FIELDS = {
+    "a": ("ask_price", "ask_whole_lot_volume", "ask_lot_volume"),
+    "b": ("bid_price", "bid_whole_lot_volume", "bid_lot_volume"),
+    "c": ("last_trade_price", "last_trade_lot_volume"),
+    "v": ("volume_today", "volume_24h"),
+    "p": ("vwap_today", "vwap_24h"),
+    "t": ("trades_today", "trades_24h"),
+    "l": ("low_today", "low_24h"),
+    "h": ("high_today", "high_24h"),
+    "o": ("opening_price",),
+}
+TICKER_COLUMNS = [
+    column for columns in TICKER_FIELDS.values() for column in columns
+]
+
+
+@typechecked
+def _ragged(cells: list[Any], *, width: int = 1) -> list[np.ndarray]:
+    """Convert a column of nested lists to float arrays in a single pass."""
+    lengths = np.fromiter(map(len, cells), dtype=np.int64, count=len(cells))
+    flat = np.array(
+        [value for cell in cells for item in cell for value in item]
+        if width > 1
+        else [value for cell in cells for value in cell],
+        dtype=np.float64,
+    )
+    arrays = np.split(flat, np.cumsum(lengths * width)[:-1])
+    if width > 1:
+        return [array.reshape(-1, width) for array in arrays]
+
+    return arrays
+
+
+@typechecked
+def _ticker_table(result: dict[str, Any]) -> np.ndarray:
+    """Flatten a ticker payload to one float row per pair."""
+    table = np.array(
+        [
+            [
+                value
+                for key in TICKER_FIELDS
+                for value in (
+                    (ticker[key],)
+                    if isinstance(ticker[key], str)
+                    else ticker[key]
+                )
+            ]
+            for ticker in result.values()
+        ],
+        dtype=np.float64,
+    )
+    return table.reshape(len(result), len(TICKER_COLUMNS))
+
+
+@typechecked
+def _request_key(
+    method: str, params: dict[str, Any], raw: bool, options: dict[str, Any]
+) -> tuple:
+    """Key under which identical concurrent calls are coalesced."""
+    return (
+        method,
+        tuple(sorted(params.items())),
+        raw,
+        tuple(sorted(options.items())),
+    )
 
 
 @typechecked
-def _make_array(junk: Any) -> np.ndarray:
-    return np.asarray(junk).astype(np.float)
+def _timed_parse(
+    metrics: Metrics | None,
+    method: str,
+    parse: Callable[..., Any],
+    response: httpx.Response,
+    options: dict[str, Any],
+) -> Any:
+    if metrics is None:
+        return parse(response, **options)
+
+    start = time.perf_counter()
+    result = parse(response, **options)
+    metrics.observe(
+        "okapi_parse_seconds", time.perf_counter() - start, endpoint=method
+    )
+    return result
 
 
 @typechecked
@@ -57,218 +152,899 @@ def _format_ohlc(
     freq = str(interval) + "T" if ascending else str(-interval) + "T"
     ohlc.index.freq = freq
     for col in ["open", "high", "low", "close", "vwap", "volume"]:
-        ohlc.loc[:, col] = ohlc[col].astype(float)
+        if ohlc[col].dtype != np.float64:
+            ohlc.loc[:, col] = ohlc[col].astype(float)
 
     return ohlc
 
 
+OHLC_COLUMNS = [
+    "time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "vwap",
+    "volume",
+    "count",
+]
+OHLC_DTYPES = dict(
+    zip(
+        OHLC_COLUMNS,
+        (
+            np.int64,
+            np.float64,
+            np.float64,
+            np.float64,
+            np.float64,
+            np.float64,
+            np.float64,
+            np.int64,
+        ),
+    )
+)
+OHLC_PRICES = ["open", "high", "low", "close", "vwap"]
+Columns = dict[str, np.ndarray]
+
+
 @typechecked
-class MarketRESTAPI:
-    """Kraken public API."""
+def _ohlc_columns(rows: list[list[Any]]) -> Columns:
+    if len(rows) == 0:
+        return {
+            name: np.empty(0, dtype=dtype)
+            for name, dtype in OHLC_DTYPES.items()
+        }
+
+    table = np.array(rows, dtype=str)
+    return {
+        name: table[:, i].astype(dtype)
+        for i, (name, dtype) in enumerate(OHLC_DTYPES.items())
+    }
+
+
+@typechecked
+def _ohlc_views(response: httpx.Response) -> tuple[dict[str, Columns], int]:
+    """OHLC columns per pair, views on the decoded table when possible."""
+    decoded = numeric_tables(response, len(OHLC_COLUMNS))
+    if decoded is None:
+        result = content(response)
+        last = int(result.pop("last"))
+        return {
+            pair: _ohlc_columns(rows) for pair, rows in result.items()
+        }, last
+
+    tables, last = decoded
+    return {
+        pair: {name: table[:, i] for i, name in enumerate(OHLC_COLUMNS)}
+        for pair, table in tables.items()
+    }, last
+
+
+@typechecked
+def _decode_ohlc(response: httpx.Response) -> tuple[dict[str, Columns], int]:
+    """Typed OHLC columns per pair and the ``last`` cursor of a response."""
+    pairs, last = _ohlc_views(response)
+    return {
+        pair: {
+            name: columns[name].astype(dtype)
+            for name, dtype in OHLC_DTYPES.items()
+        }
+        for pair, columns in pairs.items()
+    }, last
+
+
+@typechecked
+@dataclass(frozen=True)
+class CompactOHLC:
+    """Dtypes of compact OHLC frames.
+
+    A compact frame is indexed by the candle ``time`` in seconds since the
+    epoch and holds the prices as ``price``, the volume as ``volume`` and
+    the number of trades as ``count``. With an integer ``price``, prices
+    count units of ``10 ** -decimals``: give the ``pair_decimals`` of the
+    pair (see ``tradable_asset_pairs``) to keep them exact.
+    """
+
+    price: str = "float32"
+    volume: str = "float32"
+    count: str = "int32"
+    decimals: int | None = None
+
+    def __post_init__(self) -> None:
+        if np.issubdtype(self.price, np.integer) and self.decimals is None:
+            raise ValueError("integer prices need the pair decimals.")
+
+    def frame(self, columns: Columns) -> pd.DataFrame:
+        """Compact frame of OHLC columns, sorted by time.
+
+        Each column is converted once, straight into the memory of the
+        frame: the prices into a single block, built before the frame.
+        """
+        time = columns["time"]
+        order = None
+        if np.any(time[1:] < time[:-1]):
+            order = np.argsort(time, kind="stable")
+
+        def sorted_column(name: str) -> np.ndarray:
+            column = columns[name]
+            return column if order is None else column[order]
+
+        prices = np.empty((len(OHLC_PRICES), len(time)), dtype=self.price)
+        if self.decimals is not None and prices.dtype.kind in "iu":
+            scaled = np.empty(len(time))
+            bounds = np.iinfo(prices.dtype)
+            for row, name in zip(prices, OHLC_PRICES):
+                np.multiply(sorted_column(name), 10.0**self.decimals, scaled)
+                np.rint(scaled, out=scaled)
+                if scaled.size and (
+                    scaled.min() < bounds.min or scaled.max() > bounds.max
+                ):
+                    raise OverflowError(f"{name} overflows {prices.dtype}.")
+
+                row[:] = scaled
+        else:
+            for row, name in zip(prices, OHLC_PRICES):
+                row[:] = sorted_column(name)
+
+        index = pd.Index(
+            sorted_column("time").astype(np.int64, copy=False), name="time"
+        )
+        frame = pd.DataFrame(
+            prices.T, index=index, columns=OHLC_PRICES, copy=False
+        )
+        frame["volume"] = sorted_column("volume").astype(
+            self.volume, copy=False
+        )
+        frame["count"] = sorted_column("count").astype(self.count, copy=False)
+        return frame
+
+
+TRADE_DTYPES = {
+    "price": np.float64,
+    "volume": np.float64,
+    "time": np.float64,
+    "buy": np.bool_,
+    "market": np.bool_,
+    "trade_id": np.int64,
+}
+
+
+@typechecked
+def _trade_columns(rows: list[list[Any]]) -> dict[str, np.ndarray]:
+    """Convert trade rows to typed columns.
+
+    Sides and order types become booleans; ``trade_id`` is -1 when Kraken
+    does not send it.
+    """
+    if len(rows) == 0:
+        return {
+            name: np.empty(0, dtype=dtype)
+            for name, dtype in TRADE_DTYPES.items()
+        }
+
+    fields = list(zip(*rows))
+    return {
+        "price": np.array(fields[0], dtype=np.float64),
+        "volume": np.array(fields[1], dtype=np.float64),
+        "time": np.array(fields[2], dtype=np.float64),
+        "buy": np.array(fields[3]) == "b",
+        "market": np.array(fields[4]) == "m",
+        "trade_id": (
+            np.array(fields[6], dtype=np.int64)
+            if len(fields) > 6
+            else np.full(len(rows), -1, dtype=np.int64)
+        ),
+    }
+
+
+@typechecked
+def _asset_info_frame(result: dict[str, Any]) -> pd.DataFrame:
+    return pd.DataFrame(result)
+
+
+@typechecked
+def _parse_asset_info(response: httpx.Response) -> pd.DataFrame:
+    return _asset_info_frame(content(response))
+
+
+@typechecked
+def _tradable_asset_pairs_frame(result: dict[str, Any]) -> pd.DataFrame:
+    result = pd.DataFrame.from_dict(
+        result,
+        orient="index",
+    )
+    dtypes = {
+        "pair_decimals": "int",
+        "lot_decimals": "int",
+        "lot_multiplier": "int",
+        "margin_call": "int",
+        "margin_stop": "int",
+        "ordermin": "float",
+    }
+    result = result.astype(
+        dtype={
+            column: dtype
+            for column, dtype in dtypes.items()
+            if column in result
+        }
+    )
+    for column, width in (
+        ("fees", 2),
+        ("fees_maker", 2),
+        ("leverage_buy", 1),
+        ("leverage_sell", 1),
+    ):
+        if column in result:
+            result[column] = _ragged(result[column].tolist(), width=width)
+
+    return result
+
+
+@typechecked
+def _parse_tradable_asset_pairs(response: httpx.Response) -> pd.DataFrame:
+    return _tradable_asset_pairs_frame(content(response))
+
+
+@typechecked
+def _parse_ticker_information(
+    response: httpx.Response, *, columnar: bool = False
+) -> pd.DataFrame:
+    result = content(response)
+    table = _ticker_table(result)
+    if columnar:
+        ticker = pd.DataFrame(
+            table, index=list(result), columns=TICKER_COLUMNS
+        )
+        return ticker.astype({"trades_today": "int", "trades_24h": "int"})
+
+    ticker = pd.DataFrame(index=list(result))
+    start = 0
+    for key, columns in TICKER_FIELDS.items():
+        stop = start + len(columns)
+        ticker[key] = list(table[:, start:stop])
+        start = stop
+
+    ticker["o"] = table[:, -1]
+    return ticker
+
+
+@typechecked
+def _parse_ohlc_data(
+    response: httpx.Response,
+    *,
+    interval: int,
+    compact: CompactOHLC | None = None,
+) -> dict[str, pd.DataFrame | int]:
+    parsed: dict[str, pd.DataFrame | int]
+    if compact is not None:
+        pairs, last = _ohlc_views(response)
+        parsed = {
+            pair: compact.frame(columns) for pair, columns in pairs.items()
+        }
+    else:
+        pairs, last = _decode_ohlc(response)
+        parsed = {
+            pair: _format_ohlc(pd.DataFrame(columns), interval=interval)
+            for pair, columns in pairs.items()
+        }
+
+    parsed["last"] = last
+    return parsed
+
+
+@typechecked
+def _parse_order_book(
+    response: httpx.Response,
+) -> dict[str, OrderBookSnapshot]:
+    return {
+        pair: OrderBookSnapshot.from_levels(book["asks"], book["bids"])
+        for pair, book in content(response).items()
+    }
+
+
+@typechecked
+def _parse_recent_spreads(
+    response: httpx.Response,
+) -> dict[str, np.ndarray | int]:
+    result = content(response)
+    last = int(result.pop("last"))
+    parsed: dict[str, np.ndarray | int] = {
+        pair: _spreads(spreads) for pair, spreads in result.items()
+    }
+    parsed["last"] = last
+    return parsed
+
+
+@typechecked
+def _parse_recent_trades(
+    response: httpx.Response,
+) -> dict[str, pd.DataFrame | int]:
+    result = content(response)
+    last = int(result.pop("last"))
+    parsed: dict[str, pd.DataFrame | int] = {}
+    for pair, trades in result.items():
+        columns = _trade_columns(trades)
+        index = pd.DatetimeIndex(
+            (columns["time"] * 1e9).astype("datetime64[ns]"), name="dtime"
+        )
+        parsed[pair] = pd.DataFrame(columns, index=index)
+
+    parsed["last"] = last
+    return parsed
+
+
+@typechecked
+@dataclass
+class OHLCBatch:
+    """OHLC data fetched for several pairs.
+
+    Frames, ``last`` cursors and errors are keyed by the requested pair, so
+    a pair that failed does not hide the ones that succeeded.
+    """
+
+    frames: dict[str, pd.DataFrame] = field(default_factory=dict)
+    last: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    def add(self, pair: str, result: dict[str, pd.DataFrame | int]) -> None:
+        """Record the parsed OHLC response of a pair."""
+        result = dict(result)
+        self.last[pair] = int(result.pop("last"))
+        (self.frames[pair],) = result.values()
+
+    def to_frame(self) -> pd.DataFrame:
+        """Concatenate the frames under a (pair, dtime) MultiIndex."""
+        if not self.frames:
+            return pd.DataFrame(columns=OHLC_COLUMNS)
+
+        return pd.concat(self.frames, names=["pair"])
+
+
+@typechecked
+def _since(since: Since, pair: str) -> int | None:
+    if isinstance(since, dict):
+        return since.get(pair)
+
+    return since
+
+
+@typechecked
+class _BaseMarketRESTAPI:
+    """Request building shared by the sync and async Kraken public API."""
 
     valid_interval = (1, 5, 15, 30, 60, 240, 1440, 10080, 21600)
     info = ("info", "leverage", "fees", "margin")
 
+    @staticmethod
+    def _asset_info_params(
+        asset: Iterable[str] | str | None, aclass: str
+    ) -> dict[str, str]:
+        if asset is None:
+            return {"aclass": aclass}
+
+        if isinstance(asset, str):
+            asset = (asset,)
+
+        return {
+            "asset": ",".join(asset),
+            "aclass": aclass,
+        }
+
+    def _tradable_asset_pairs_params(
+        self, pair: Pair | None, info: str
+    ) -> dict[str, str]:
+        if info not in self.info:
+            raise ValueError(f"{info} not invalid info {self.info}")
+
+        if pair is None:
+            return {"info": info}
+
+        return {
+            "pair": _make_pair(pair),
+            "info": info,
+        }
+
+    @staticmethod
+    def _ticker_information_params(pair: Pair) -> dict[str, str]:
+        return {
+            "pair": _make_pair(pair),
+        }
+
+    @staticmethod
+    def _order_book_params(pair: Pair, count: int) -> dict[str, str | int]:
+        return {
+            "pair": _make_pair(pair),
+            "count": count,
+        }
+
+    @staticmethod
+    def _recent_spreads_params(
+        pair: Pair, since: int | None
+    ) -> dict[str, str | int]:
+        data: dict[str, str | int] = {
+            "pair": _make_pair(pair),
+        }
+
+        if since is not None:
+            data["since"] = since
+
+        return data
+
+    @staticmethod
+    def _recent_trades_params(
+        pair: Pair, since: int | None, count: int | None
+    ) -> dict[str, str | int]:
+        data: dict[str, str | int] = {
+            "pair": _make_pair(pair),
+        }
+
+        if since is not None:
+            data["since"] = since
+
+        if count is not None:
+            data["count"] = count
+
+        return data
+
+    def _check_interval(self, interval: int) -> None:
+        if interval not in self.valid_interval:
+            raise ValueError(
+                f"interval {interval} not in valid intervals "
+                f"{self.valid_interval}."
+            )
+
+    def _ohlc_data_params(
+        self, pair: Pair, interval: int, since: int | None
+    ) -> dict[str, str | int]:
+        self._check_interval(interval)
+        data: dict[str, str | int] = {
+            "pair": _make_pair(pair),
+            "interval": interval,
+        }
+
+        if since is not None:
+            data["since"] = since
+
+        return data
+
+
+@typechecked
+class MarketRESTAPI(_BaseMarketRESTAPI):
+    """Kraken public API."""
+
     def __init__(self, client: Client) -> None:
         self.client = client
 
+    def _get(
+        self,
+        method: str,
+        params: dict[str, Any],
+        parse: Callable[..., Any],
+        *,
+        raw: bool,
+        **options: Any,
+    ) -> Any:
+        def fetch() -> Any:
+            response = self.client.get(url=public_url(method), params=params)
+            if raw:
+                return response
+
+            return _timed_parse(
+                self.client.metrics, method, parse, response, options
+            )
+
+        return self.client.coalesced(
+            _request_key(method, params, raw, options), fetch
+        )
+
     def server_time(
         self,
         *,
         raw: bool = False,
     ) -> httpx.Response | dict[str, datetime | int]:
         """Get the server's time."""
-        response = self.client.get(url=public_url("Time"))
-        if raw:
-            return response
-
-        response = content(response)
-        response["unixtime"] = int(response["unixtime"])
-        response["rfc1123"] = datetime.strptime(
-            response["rfc1123"],
-            "%a, %d %b %y %H:%M:%S %z",
-        )
-        return response
+        return self._get("Time", {}, _parse_server_time, raw=raw)
 
     def system_status(
         self,
         *,
         raw: bool = False,
-    ) -> httpx.Response | dict[str, datetime | int]:
+    ) -> httpx.Response | dict[str, datetime | str]:
         """Get the current system status or trading mode."""
-        response = self.client.get(url=public_url("SystemStatus"))
-        if raw:
-            return response
-
-        response = content(response)
-        response["timestamp"] = datetime.strptime(
-            response["timestamp"],
-            "%Y-%m-%dT%H:%M:%SZ",
-        )
-        return response
+        return self._get("SystemStatus", {}, _parse_system_status, raw=raw)
 
     def asset_info(
         self,
-        asset: Iterable[str] | str = "XBT",
+        asset: Iterable[str] | str | None = "XBT",
         *,
         aclass: str = "currency",
         raw: bool = False,
     ) -> httpx.Response | pd.DataFrame:
-        """Get information about the assets that are available for deposit,
-        withdrawal, trading and staking."""
-        if isinstance(asset, str):
-            asset = (asset,)
+        """Get information about the assets.
 
-        response = self.client.get(
-            url=public_url("Assets"),
-            params={
-                "asset": ",".join(asset),
-                "aclass": aclass,
-            },
+        Covers the assets available for deposit, withdrawal, trading and
+        staking: all of them when ``asset`` is None.
+        """
+        return self._get(
+            "Assets",
+            self._asset_info_params(asset, aclass),
+            _parse_asset_info,
+            raw=raw,
         )
-        if raw:
-            return response
-
-        response = content(response)
-        return pd.DataFrame(response)
 
     def tradable_asset_pairs(
         self,
-        pair: Pair = ("XBT", "USD"),
+        pair: Pair | None = ("XBT", "USD"),
         *,
         info: str = "info",
         raw: bool = False,
     ) -> httpx.Response | pd.DataFrame:
-        """Get tradable asset pairs."""
-        if info not in self.info:
-            raise ValueError(f"{info} not invalid info {self.info}")
+        """Get tradable asset pairs (all of them when pair is None)."""
+        return self._get(
+            "AssetPairs",
+            self._tradable_asset_pairs_params(pair, info),
+            _parse_tradable_asset_pairs,
+            raw=raw,
+        )
 
-        pair = _make_pair(pair)
+    def ticker_information(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        columnar: bool = False,
+        raw: bool = False,
+    ) -> httpx.Response | pd.DataFrame:
+        """Get Ticker Information.
 
-        data = {
-            "pair": "".join(pair),
-            "info": info,
-        }
+        With ``columnar``, every ticker field gets its own typed column
+        (``ask_price``, ``vwap_24h``, ...) instead of an array per cell.
+
+        Note: Today's prices start at midnight UTC
+        """
+        return self._get(
+            "Ticker",
+            self._ticker_information_params(pair),
+            _parse_ticker_information,
+            raw=raw,
+            columnar=columnar,
+        )
+
+    def ohlc_data(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        interval: int = 1,
+        since: int | None = None,
+        raw: bool = False,
+        compact: CompactOHLC | None = None,
+    ) -> httpx.Response | dict[str, pd.DataFrame | int]:
+        """Get OHLC Data.
+
+        With ``compact``, frames are built with its dtypes, indexed by time
+        in seconds, instead of float64 frames indexed by datetime.
+        """
+        return self._get(
+            "OHLC",
+            self._ohlc_data_params(pair, interval, since),
+            _parse_ohlc_data,
+            raw=raw,
+            interval=interval,
+            compact=compact,
+        )
+
+    def order_book(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        count: int = 100,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, OrderBookSnapshot]:
+        """Get Order Book.
 
-        response = self.client.get(
-            url=public_url("AssetPairs"),
-            params=data,
+        Each side is a structured array of price, volume and timestamp.
+        """
+        return self._get(
+            "Depth",
+            self._order_book_params(pair, count),
+            _parse_order_book,
+            raw=raw,
         )
-        if raw:
-            return response
 
-        response = content(response)
-        response = pd.DataFrame.from_dict(
-            response,
-            orient="index",
+    def recent_spreads(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        since: int | None = None,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, np.ndarray | int]:
+        """Get Recent Spreads.
+
+        Spreads are structured arrays of time, bid and ask.
+        """
+        return self._get(
+            "Spread",
+            self._recent_spreads_params(pair, since),
+            _parse_recent_spreads,
+            raw=raw,
         )
-        response = response.astype(
-            dtype={
-                "pair_decimals": "int",
-                "lot_decimals": "int",
-                "lot_multiplier": "int",
-                "margin_call": "int",
-                "margin_stop": "int",
-                "ordermin": "float",
+
+    def recent_trades(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        since: int | None = None,
+        count: int | None = None,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, pd.DataFrame | int]:
+        """Get Recent Trades.
+
+        ``since`` and the returned ``last`` are nanosecond cursors.
+        """
+        return self._get(
+            "Trades",
+            self._recent_trades_params(pair, since, count),
+            _parse_recent_trades,
+            raw=raw,
+        )
+
+    def ohlc_data_many(
+        self,
+        pairs: Iterable[Pair],
+        *,
+        interval: int = 1,
+        since: Since = None,
+        concurrency: int = 8,
+        compact: CompactOHLC | None = None,
+    ) -> OHLCBatch:
+        """Get OHLC Data for several pairs concurrently.
+
+        At most ``concurrency`` requests are in flight at once on the shared
+        client. ``since`` is either common to every pair or given per pair.
+        """
+        self._check_interval(interval)
+        names = [_make_pair(pair) for pair in pairs]
+        batch = OHLCBatch()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {
+                name: pool.submit(
+                    self.ohlc_data,
+                    name,
+                    interval=interval,
+                    since=_since(since, name),
+                    compact=compact,
+                )
+                for name in names
             }
+
+        for name, future in futures.items():
+            try:
+                batch.add(name, future.result())
+            except Exception as error:  # pylint: disable=broad-except
+                batch.errors[name] = error
+
+        return batch
+
+
+@typechecked
+class AsyncMarketRESTAPI(_BaseMarketRESTAPI):
+    """Asynchronous Kraken public API."""
+
+    def __init__(self, client: AsyncClient) -> None:
+        self.client = client
+
+    async def _get(
+        self,
+        method: str,
+        params: dict[str, Any],
+        parse: Callable[..., Any],
+        *,
+        raw: bool,
+        **options: Any,
+    ) -> Any:
+        async def fetch() -> Any:
+            response = await self.client.get(
+                url=public_url(method), params=params
+            )
+            if raw:
+                return response
+
+            return _timed_parse(
+                self.client.metrics, method, parse, response, options
+            )
+
+        return await self.client.coalesced(
+            _request_key(method, params, raw, options), fetch
         )
-        response["fees"] = response["fees"].map(_make_array)
-        response["fees_maker"] = response["fees_maker"].map(_make_array)
-        response["leverage_buy"] = response["leverage_buy"].map(_make_array)
-        response["leverage_sell"] = response["leverage_sell"].map(_make_array)
-        return response
 
-    def ticker_information(
+    async def server_time(
+        self,
+        *,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, datetime | int]:
+        """Get the server's time."""
+        return await self._get("Time", {}, _parse_server_time, raw=raw)
+
+    async def system_status(
+        self,
+        *,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, datetime | str]:
+        """Get the current system status or trading mode."""
+        return await self._get(
+            "SystemStatus", {}, _parse_system_status, raw=raw
+        )
+
+    async def asset_info(
+        self,
+        asset: Iterable[str] | str | None = "XBT",
+        *,
+        aclass: str = "currency",
+        raw: bool = False,
+    ) -> httpx.Response | pd.DataFrame:
+        """Get information about the assets.
+
+        Covers the assets available for deposit, withdrawal, trading and
+        staking: all of them when ``asset`` is None.
+        """
+        return await self._get(
+            "Assets",
+            self._asset_info_params(asset, aclass),
+            _parse_asset_info,
+            raw=raw,
+        )
+
+    async def tradable_asset_pairs(
+        self,
+        pair: Pair | None = ("XBT", "USD"),
+        *,
+        info: str = "info",
+        raw: bool = False,
+    ) -> httpx.Response | pd.DataFrame:
+        """Get tradable asset pairs (all of them when pair is None)."""
+        return await self._get(
+            "AssetPairs",
+            self._tradable_asset_pairs_params(pair, info),
+            _parse_tradable_asset_pairs,
+            raw=raw,
+        )
+
+    async def ticker_information(
         self,
         pair: Pair = ("XBT", "USD"),
         *,
+        columnar: bool = False,
         raw: bool = False,
     ) -> httpx.Response | pd.DataFrame:
         """Get Ticker Information.
 
+        With ``columnar``, every ticker field gets its own typed column
+        (``ask_price``, ``vwap_24h``, ...) instead of an array per cell.
+
         Note: Today's prices start at midnight UTC
         """
-        pair = _make_pair(pair)
+        return await self._get(
+            "Ticker",
+            self._ticker_information_params(pair),
+            _parse_ticker_information,
+            raw=raw,
+            columnar=columnar,
+        )
 
-        data = {
-            "pair": "".join(pair),
-        }
+    async def ohlc_data(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        interval: int = 1,
+        since: int | None = None,
+        raw: bool = False,
+        compact: CompactOHLC | None = None,
+    ) -> httpx.Response | dict[str, pd.DataFrame | int]:
+        """Get OHLC Data.
 
-        response = self.client.get(
-            url=public_url("Ticker"),
-            params=data,
+        With ``compact``, frames are built with its dtypes, indexed by time
+        in seconds, instead of float64 frames indexed by datetime.
+        """
+        return await self._get(
+            "OHLC",
+            self._ohlc_data_params(pair, interval, since),
+            _parse_ohlc_data,
+            raw=raw,
+            interval=interval,
+            compact=compact,
         )
-        if raw:
-            return response
 
-        response = content(response)
-        response = pd.DataFrame.from_dict(
-            response,
-            orient="index",
+    async def order_book(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        count: int = 100,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, OrderBookSnapshot]:
+        """Get Order Book.
+
+        Each side is a structured array of price, volume and timestamp.
+        """
+        return await self._get(
+            "Depth",
+            self._order_book_params(pair, count),
+            _parse_order_book,
+            raw=raw,
         )
-        response["a"] = response["a"].map(_make_array)
-        response["b"] = response["b"].map(_make_array)
-        response["c"] = response["c"].map(_make_array)
-        response["v"] = response["v"].map(_make_array)
-        response["p"] = response["p"].map(_make_array)
-        response["t"] = response["t"].map(_make_array)
-        response["l"] = response["h"].map(_make_array)
-        response["h"] = response["l"].map(_make_array)
-        response["o"] = response["o"].map(_make_array)
-        return response
 
-    def ohlc_data(
+    async def recent_spreads(
+        self,
+        pair: Pair = ("XBT", "USD"),
+        *,
+        since: int | None = None,
+        raw: bool = False,
+    ) -> httpx.Response | dict[str, np.ndarray | int]:
+        """Get Recent Spreads.
+
+        Spreads are structured arrays of time, bid and ask.
+        """
+        return await self._get(
+            "Spread",
+            self._recent_spreads_params(pair, since),
+            _parse_recent_spreads,
+            raw=raw,
+        )
+
+    async def recent_trades(
         self,
         pair: Pair = ("XBT", "USD"),
         *,
-        interval: int = 1,
         since: int | None = None,
+        count: int | None = None,
         raw: bool = False,
     ) -> httpx.Response | dict[str, pd.DataFrame | int]:
-        """Get OHLC Data."""
-        pair = _make_pair(pair)
+        """Get Recent Trades.
 
-        if interval not in self.valid_interval:
-            raise ValueError(
-                f"interval {interval} not in valid intervals "
-                f"{self.valid_interval}."
-            )
+        ``since`` and the returned ``last`` are nanosecond cursors.
+        """
+        return await self._get(
+            "Trades",
+            self._recent_trades_params(pair, since, count),
+            _parse_recent_trades,
+            raw=raw,
+        )
 
-        data = {
-            "pair": "".join(pair),
-            "interval": interval,
-        }
+    async def ohlc_data_many(
+        self,
+        pairs: Iterable[Pair],
+        *,
+        interval: int = 1,
+        since: Since = None,
+        concurrency: int = 64,
+        compact: CompactOHLC | None = None,
+    ) -> OHLCBatch:
+        """Get OHLC Data for several pairs concurrently.
 
-        if since is not None:
-            data["since"] = since
+        At most ``concurrency`` requests are in flight at once on the shared
+        client. ``since`` is either common to every pair or given per pair.
+        """
+        self._check_interval(interval)
+        names = [_make_pair(pair) for pair in pairs]
+        semaphore = asyncio.Semaphore(concurrency)
 
-        response = self.client.get(
-            url=public_url("OHLC"),
-            params=data,
+        async def fetch(name: str) -> dict[str, pd.DataFrame | int]:
+            async with semaphore:
+                return await self.ohlc_data(
+                    name,
+                    interval=interval,
+                    since=_since(since, name),
+                    compact=compact,
+                )
+
+        results = await asyncio.gather(
+            *(fetch(name) for name in names), return_exceptions=True
         )
-        if raw:
-            return response
-
-        response = content(response)
-        last = int(response.pop("last"))
-        response = {
-            pair: _format_ohlc(
-                pd.DataFrame(
-                    ohlc,
-                    columns=[
-                        "time",
-                        "open",
-                        "high",
-                        "low",
-                        "close",
-                        "vwap",
-                        "volume",
-                        "count",
-                    ],
-                ),
-                interval=interval,
-            )
-            for pair, ohlc in response.items()
-        }
-        response["last"] = last
-        return response
+        batch = OHLCBatch()
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                batch.errors[name] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                batch.add(name, result)
+
+        return batch
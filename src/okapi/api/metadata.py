@@ -0,0 +1,131 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cache of the Kraken static metadata (assets and asset pairs)."""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+import pandas as pd
+
+from ..typecheck import typechecked
+from .market import _asset_info_frame
+from .market import _tradable_asset_pairs_frame
+from .market import MarketRESTAPI
+from .utils import content
+
+
+@typechecked
+class MetadataCache:
+    """Assets and asset pairs of Kraken, fetched at most once per ``ttl``.
+
+    Both endpoints are queried for every entry and the parsed frames are
+    kept in memory until they expire or are invalidated. When ``path`` is
+    given, the raw results are also written there so that a new process
+    reuses them, without any request, until they expire.
+    """
+
+    def __init__(
+        self,
+        market: MarketRESTAPI,
+        *,
+        ttl: float = 86400.0,
+        path: str | Path | None = None,
+    ) -> None:
+        self.market = market
+        self.ttl = ttl
+        self.path = None if path is None else Path(path)
+        self._fetchers: dict[str, Callable[[], Any]] = {
+            "assets": lambda: market.asset_info(None, raw=True),
+            "asset_pairs": lambda: market.tradable_asset_pairs(None, raw=True),
+        }
+        self._parsers: dict[str, Callable[[Any], pd.DataFrame]] = {
+            "assets": _asset_info_frame,
+            "asset_pairs": _tradable_asset_pairs_frame,
+        }
+        self._results: dict[str, dict[str, Any]] = {}
+        self._frames: dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self._results = json.loads(self.path.read_text())
+
+    def _fresh(self, name: str) -> bool:
+        result = self._results.get(name)
+        return (
+            result is not None and time.time() - result["fetched"] < self.ttl
+        )
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._results))
+        os.replace(tmp_path, self.path)
+
+    def _get(self, name: str) -> pd.DataFrame:
+        with self._lock:
+            if not self._fresh(name):
+                self._results[name] = {
+                    "fetched": time.time(),
+                    "result": content(self._fetchers[name]()),
+                }
+                self._frames.pop(name, None)
+                self._save()
+
+            if name not in self._frames:
+                self._frames[name] = self._parsers[name](
+                    self._results[name]["result"]
+                )
+
+            return self._frames[name]
+
+    def asset_info(self) -> pd.DataFrame:
+        """Information about every asset, one column per asset."""
+        return self._get("assets")
+
+    def tradable_asset_pairs(self) -> pd.DataFrame:
+        """Information about every asset pair, one row per pair."""
+        return self._get("asset_pairs")
+
+    def pair_info(self, pair: str) -> pd.Series:
+        """Information about a pair, by Kraken name or alternate name."""
+        pairs = self.tradable_asset_pairs()
+        if pair in pairs.index:
+            return pairs.loc[pair]
+
+        matches = pairs.index[pairs["altname"] == pair]
+        if len(matches) == 0:
+            raise KeyError(f"unknown pair {pair}.")
+
+        return pairs.loc[matches[0]]
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop ``assets``, ``asset_pairs`` or, by default, both."""
+        names = tuple(self._fetchers) if name is None else (name,)
+        with self._lock:
+            for key in names:
+                if key not in self._fetchers:
+                    raise ValueError(
+                        f"{key} not in valid names {tuple(self._fetchers)}."
+                    )
+
+                self._results.pop(key, None)
+                self._frames.pop(key, None)
+
+            self._save()
@@ -0,0 +1,49 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Kraken server time and system status.
+
+Parsing these does not need pandas nor NumPy, so that the command-line
+interface can query them without importing either.
+"""
+from datetime import datetime
+from datetime import timezone
+
+import httpx
+
+from ..typecheck import typechecked
+from .utils import content
+
+
+@typechecked
+def _parse_server_time(response: httpx.Response) -> dict[str, datetime | int]:
+    unixtime = int(str(content(response)["unixtime"]))
+    # rfc1123 holds the same second as unixtime: no need to parse it.
+    return {
+        "unixtime": unixtime,
+        "rfc1123": datetime.fromtimestamp(unixtime, tz=timezone.utc),
+    }
+
+
+@typechecked
+def _parse_system_status(
+    response: httpx.Response,
+) -> dict[str, datetime | str]:
+    result: dict[str, datetime | str] = {
+        key: str(value) for key, value in content(response).items()
+    }
+    result["timestamp"] = datetime.strptime(
+        str(result["timestamp"]),
+        "%Y-%m-%dT%H:%M:%SZ",
+    )
+    return result
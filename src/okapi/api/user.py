@@ -13,9 +13,11 @@
 # limitations under the License.
 """Kraken User's Data private API."""
 import httpx
-from typeguard import typechecked
 
+from ..client import AsyncClient
 from ..client import Client
+from ..typecheck import typechecked
+from .utils import KrakenData
 from .utils import nonce_data
 from .utils import private_url
 
@@ -27,16 +29,46 @@ class DataRESTAPI:
     def __init__(self, client: Client) -> None:
         self.client = client
 
-    def account_balance(self) -> httpx.Response:
-        """Retrieve all cash balances, net of pending withdrawals."""
+    def _post(
+        self, method: str, data: KrakenData | None = None
+    ) -> httpx.Response:
+        data = nonce_data(data, self.client.nonce_provider)
         return self.client.post(
-            url=private_url("Balance"),
-            data=nonce_data(),
+            url=private_url(method),
+            data=data,
+            extensions={"nonce": data["nonce"]},
         )
 
+    def account_balance(self) -> httpx.Response:
+        """Retrieve all cash balances, net of pending withdrawals."""
+        return self._post("Balance")
+
     def trade_balance(self, asset: str = "ZUSD") -> httpx.Response:
         """Retrieve all cash balances, net of pending withdrawals."""
-        return self.client.post(
-            url=private_url("TradeBalance"),
-            data=nonce_data({"asset": asset}),
+        return self._post("TradeBalance", {"asset": asset})
+
+
+@typechecked
+class AsyncDataRESTAPI:
+    """Asynchronous Kraken User's data API."""
+
+    def __init__(self, client: AsyncClient) -> None:
+        self.client = client
+
+    async def _post(
+        self, method: str, data: KrakenData | None = None
+    ) -> httpx.Response:
+        data = nonce_data(data, self.client.nonce_provider)
+        return await self.client.post(
+            url=private_url(method),
+            data=data,
+            extensions={"nonce": data["nonce"]},
         )
+
+    async def account_balance(self) -> httpx.Response:
+        """Retrieve all cash balances, net of pending withdrawals."""
+        return await self._post("Balance")
+
+    async def trade_balance(self, asset: str = "ZUSD") -> httpx.Response:
+        """Retrieve all cash balances, net of pending withdrawals."""
+        return await self._post("TradeBalance", {"asset": asset})
@@ -11,35 +11,74 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Utility functions for the Kraken API."""
-import time
+"""Utility functions for the Kraken API.
+
+Responses are decoded with orjson or pysimdjson when installed (``pip
+install okapi[fast]``) and the standard library otherwise.
+"""
+import json
+from typing import Any
 
 import httpx
-from typeguard import typechecked
 
-from ..exception import KrakenAPIError
+from ..exception import kraken_error
+from ..nonce import default_nonce
+from ..nonce import NonceProvider
+from ..typecheck import typechecked
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None  # type: ignore
+
+
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    _loads = orjson.loads
+elif simdjson is not None:  # pragma: no cover
+    JSON_BACKEND = "simdjson"
+    _loads = simdjson.loads
+else:  # pragma: no cover
+    JSON_BACKEND = "json"
+    _loads = json.loads
 
 
 KrakenData = dict[str, int | bool | str]
 
 
 @typechecked
-def nonce() -> str:
-    """Return a nounce counter (monotonic clock).
+def loads(data: bytes) -> Any:
+    """Decode JSON with the fastest backend installed."""
+    return _loads(data)
+
+
+@typechecked
+def nonce(provider: NonceProvider | None = None) -> str:
+    """Return a nounce counter (nanoseconds since the epoch).
 
     References:
         * https://support.kraken.com/hc/en-us/articles/360000906023-What-is-a-nonce-
     """  # pylint: disable=line-too-long
-    return str(time.monotonic_ns())
+    if provider is None:
+        provider = default_nonce
+
+    return str(provider())
 
 
 @typechecked
-def nonce_data(data: KrakenData | None = None) -> KrakenData:
+def nonce_data(
+    data: KrakenData | None = None, provider: NonceProvider | None = None
+) -> KrakenData:
     """Add the nounce data to existing data."""
     if data is None:
         data = {}
 
-    return {"nonce": nonce(), **data}
+    return {"nonce": nonce(provider), **data}
 
 
 @typechecked
@@ -56,10 +95,14 @@ def private_url(method: str) -> str:
 
 @typechecked
 def content(response: httpx.Response) -> dict[str, str | list[str]]:
-    """Check a response for error."""
+    """Check a response for error.
+
+    Kraken errors are raised as the matching subclass of
+    ``KrakenAPIError``, see ``okapi.exception.KRAKEN_ERRORS``.
+    """
     response.raise_for_status()
-    json = response.json()
+    json = loads(response.content)
     if len(json["error"]) > 0:
-        raise KrakenAPIError(json["error"])
+        raise kraken_error(json["error"])
 
     return json["result"]
@@ -15,16 +15,25 @@
 import base64
 import hashlib
 import hmac
+import time
 import urllib.parse
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Generator
 
 import httpx
-from typeguard import typechecked
+
+from .metrics import endpoint
+from .metrics import Metrics
+from .typecheck import typechecked
 
 
 @typechecked
 def _nonce_from_request(request: httpx.Request) -> bytes:
+    nonce = request.extensions.get("nonce")
+    if nonce is not None:
+        return str(nonce).encode()
+
     data = urllib.parse.parse_qs(request.content.decode())
     nonce = data.get("nonce")
     if nonce is None:
@@ -40,6 +49,19 @@ class KrakenAuth(httpx.Auth):
 
     key: str | None = None
     secret: str | None = None
+    metrics: Metrics | None = field(default=None, repr=False)
+    _mac: hmac.HMAC | None = field(default=None, init=False, repr=False)
+    _mac_secret: str | None = field(default=None, init=False, repr=False)
+
+    def _keyed_mac(self, secret: str) -> hmac.HMAC:
+        """HMAC keyed with the decoded secret, computed once per secret."""
+        if self._mac is None or self._mac_secret != secret:
+            self._mac = hmac.new(
+                base64.b64decode(secret), None, hashlib.sha512
+            )
+            self._mac_secret = secret
+
+        return self._mac.copy()
 
     def sign_request(self, request: httpx.Request) -> str:
         """Give the signature for a request
@@ -59,7 +81,8 @@ class KrakenAuth(httpx.Auth):
             + hashlib.sha256(nonce + request.content).digest()
         )
 
-        mac = hmac.new(base64.b64decode(self.secret), message, hashlib.sha512)
+        mac = self._keyed_mac(self.secret)
+        mac.update(message)
         sigdigest = base64.b64encode(mac.digest())
 
         return sigdigest.decode()
@@ -68,7 +91,14 @@ class KrakenAuth(httpx.Auth):
         self, request: httpx.Request
     ) -> Generator[httpx.Request, httpx.Response, None]:
         if self.key is not None and self.secret is not None:
+            start = time.perf_counter()
             request.headers["API-Key"] = self.key
             request.headers["API-Sign"] = self.sign_request(request)
+            if self.metrics is not None:
+                self.metrics.observe(
+                    "okapi_sign_seconds",
+                    time.perf_counter() - start,
+                    endpoint=endpoint(request.url),
+                )
 
         yield request
@@ -0,0 +1,256 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Record and replay Kraken responses without network.
+
+A cassette is a gzipped file of JSON lines, one per exchange. Requests
+are identified by their method, path, query and form data, nonce
+excluded, so that replayed private calls match whatever their nonce.
+Credentials are never written: only the response is kept.
+
+Pass either transport to a client, e.g. ``Client(transport=
+ReplayTransport("kraken.jsonl.gz"))``.
+"""
+import asyncio
+import base64
+import gzip
+import json
+import threading
+import time
+import urllib.parse
+import weakref
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .typecheck import typechecked
+
+
+_DROPPED_HEADERS = (
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "set-cookie",
+    "connection",
+)
+Items = tuple[tuple[str, str], ...]
+Key = tuple[str, str, Items, Items]
+
+
+@typechecked
+class CassetteError(LookupError):
+    """No recorded response for a request."""
+
+
+@typechecked
+def _key(request: httpx.Request) -> Key:
+    form = urllib.parse.parse_qsl(request.content.decode())
+    return (
+        request.method,
+        request.url.path,
+        tuple(sorted(request.url.params.multi_items())),
+        tuple(
+            sorted((name, value) for name, value in form if name != "nonce")
+        ),
+    )
+
+
+@typechecked
+def _record(
+    request: httpx.Request, response: httpx.Response
+) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "method": request.method,
+        "path": request.url.path,
+        "params": sorted(request.url.params.multi_items()),
+        "form": list(_key(request)[3]),
+        "status": response.status_code,
+        "headers": [
+            [name, value]
+            for name, value in response.headers.items()
+            if name not in _DROPPED_HEADERS
+        ],
+    }
+    try:
+        record["text"] = response.content.decode()
+    except UnicodeDecodeError:
+        record["base64"] = base64.b64encode(response.content).decode()
+
+    return record
+
+
+@typechecked
+def _response(record: dict[str, Any]) -> httpx.Response:
+    content = (
+        record["text"].encode()
+        if "text" in record
+        else base64.b64decode(record["base64"])
+    )
+    return httpx.Response(
+        record["status"], headers=record["headers"], content=content
+    )
+
+
+@typechecked
+def load_cassette(path: str | Path) -> list[dict[str, Any]]:
+    """Recorded exchanges, in the order they were made."""
+    with gzip.open(path, "rt") as cassette:
+        return [json.loads(line) for line in cassette]
+
+
+@typechecked
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Forward requests to ``transport`` and record every response.
+
+    The cassette is written to ``path`` when the client is closed,
+    appended to the exchanges it already holds.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.transport = transport or httpx.HTTPTransport()
+        self.async_transport = async_transport or httpx.AsyncHTTPTransport()
+        self.records: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _keep(
+        self, request: httpx.Request, response: httpx.Response
+    ) -> httpx.Response:
+        record = _record(request, response)
+        with self._lock:
+            self.records.append(record)
+
+        return _response(record)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.transport.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+
+        return self._keep(request, response)
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        response = await self.async_transport.handle_async_request(request)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+
+        return self._keep(request, response)
+
+    def save(self) -> None:
+        """Append the exchanges recorded so far to the cassette."""
+        with self._lock:
+            records, self.records = self.records, []
+
+        if records:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(self.path, "at") as cassette:
+                for record in records:
+                    cassette.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        self.save()
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        self.save()
+        await self.async_transport.aclose()
+
+
+@typechecked
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Serve the responses of a cassette.
+
+    Every response is delayed by ``latency`` seconds and at most
+    ``concurrency`` requests are served at a time, to load test a pipeline
+    against a server of known speed. Responses recorded several times for
+    the same request are served in turn, the last one repeating.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        latency: float = 0.0,
+        concurrency: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.concurrency = concurrency
+        self.responses: dict[Key, list[dict[str, Any]]] = {}
+        self.served = 0
+        for record in load_cassette(path):
+            key = (
+                record["method"],
+                record["path"],
+                tuple(sorted(map(tuple, record["params"]))),
+                tuple(map(tuple, record["form"])),
+            )
+            self.responses.setdefault(key, []).append(record)
+
+        self._turns: dict[Key, int] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(concurrency or 1)
+        self._async_slots: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    def _next(self, request: httpx.Request) -> httpx.Response:
+        key = _key(request)
+        with self._lock:
+            records = self.responses.get(key)
+            if records is None:
+                raise CassetteError(f"no recorded response for {key}.")
+
+            turn = self._turns.get(key, 0)
+            self._turns[key] = turn + 1
+            self.served += 1
+
+        return _response(records[min(turn, len(records) - 1)])
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.concurrency is None:
+            time.sleep(self.latency)
+            return self._next(request)
+
+        with self._slots:
+            time.sleep(self.latency)
+            return self._next(request)
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        if self.concurrency is None:
+            await asyncio.sleep(self.latency)
+            return self._next(request)
+
+        # A semaphore only works in the event loop that first waited on it.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.setdefault(
+                loop, asyncio.Semaphore(self.concurrency)
+            )
+
+        async with slots:
+            await asyncio.sleep(self.latency)
+            return self._next(request)
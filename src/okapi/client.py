@@ -12,21 +12,88 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Kraken HTTPX Client."""
+import asyncio
+import time
+from collections.abc import Awaitable
+from collections.abc import Hashable
 from typing import Any
+from typing import Callable
 
 import httpx
-from typeguard import typechecked
 
 from . import __version__
 from .auth import KrakenAuth
+from .coalesce import AsyncSingleFlight
+from .coalesce import SingleFlight
+from .metrics import endpoint
+from .metrics import Metrics
+from .metrics import trace
+from .metrics import trace_async
+from .nonce import default_nonce
+from .nonce import NonceProvider
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .retry import with_fresh_nonce
+from .typecheck import typechecked
 
 
 HTTPXClientKwargs = Any
 
 
+@typechecked
+def _client_kwargs(
+    *,
+    key: str | None,
+    secret: str | None,
+    name: str,
+    domain: str,
+    api_version: int,
+    metrics: Metrics | None,
+) -> dict[str, Any]:
+    return {
+        "base_url": f"{domain}/{api_version}",
+        "auth": KrakenAuth(key=key, secret=secret, metrics=metrics),
+        "headers": {"User-Agent": name},
+    }
+
+
+@typechecked
+def _record(
+    metrics: Metrics,
+    name: str,
+    request: httpx.Request,
+    response: httpx.Response,
+    start: float,
+) -> None:
+    metrics.observe(
+        "okapi_request_seconds", time.perf_counter() - start, endpoint=name
+    )
+    metrics.increment(
+        "okapi_request_bytes_total",
+        int(request.headers.get("Content-Length", 0)),
+        endpoint=name,
+    )
+    metrics.increment(
+        "okapi_response_bytes_total",
+        int(
+            response.headers.get(
+                "Content-Length", response.num_bytes_downloaded
+            )
+        ),
+        endpoint=name,
+    )
+
+
 @typechecked
 class Client(httpx.Client):
-    """HTTX based Kraken client."""
+    """HTTX based Kraken client.
+
+    With ``coalesce``, identical public market data calls made at the same
+    time from several threads share one request and one parsed result.
+    With ``retry``, transient failures are retried following the policy.
+    With ``metrics``, latencies, sizes and retries are recorded per
+    endpoint, see ``okapi.metrics``.
+    """
 
     def __init__(
         self,
@@ -36,11 +103,216 @@ class Client(httpx.Client):
         name: str = f"okapi/{__version__}",
         domain: str = "https://api.kraken.com",
         api_version: int = 0,
+        limiter: RateLimiter | None = None,
+        nonce_provider: NonceProvider = default_nonce,
+        coalesce: bool = False,
+        retry: RetryPolicy | None = None,
+        metrics: Metrics | None = None,
         **kwargs: HTTPXClientKwargs,
     ) -> None:
+        self.limiter = limiter
+        self.nonce_provider = nonce_provider
+        self.retry = retry
+        self.metrics = metrics
+        self.flights = SingleFlight() if coalesce else None
         super().__init__(
-            base_url=f"{domain}/{api_version}",
-            auth=KrakenAuth(key=key, secret=secret),
-            headers={"User-Agent": name},
+            **_client_kwargs(
+                key=key,
+                secret=secret,
+                name=name,
+                domain=domain,
+                api_version=api_version,
+                metrics=metrics,
+            ),
             **kwargs,
         )
+
+    def _send_once(
+        self, request: httpx.Request, **kwargs: HTTPXClientKwargs
+    ) -> httpx.Response:
+        if self.metrics is None:
+            if self.limiter is not None:
+                self.limiter.acquire(request)
+
+            return super().send(request, **kwargs)
+
+        name = endpoint(request.url)
+        if self.limiter is not None:
+            start = time.perf_counter()
+            self.limiter.acquire(request)
+            self.metrics.observe(
+                "okapi_rate_limit_seconds",
+                time.perf_counter() - start,
+                endpoint=name,
+            )
+
+        request.extensions.setdefault("trace", trace(self.metrics, name))
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        _record(self.metrics, name, request, response, start)
+        return response
+
+    def send(
+        self, request: httpx.Request, **kwargs: HTTPXClientKwargs
+    ) -> httpx.Response:
+        if self.retry is None:
+            return self._send_once(request, **kwargs)
+
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            response, error = None, None
+            try:
+                response = self._send_once(request, **kwargs)
+            except httpx.TransportError as transport_error:
+                error = transport_error
+
+            delay = self.retry.delay(
+                request,
+                attempt,
+                time.monotonic() - start,
+                response=response,
+                error=error,
+            )
+            if delay is None:
+                if error is not None:
+                    raise error
+
+                return response
+
+            if response is not None:
+                response.close()
+
+            if self.metrics is not None:
+                self.metrics.increment(
+                    "okapi_retries_total", endpoint=endpoint(request.url)
+                )
+
+            time.sleep(delay)
+            request = with_fresh_nonce(request, self.nonce_provider)
+            attempt += 1
+
+    def coalesced(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """Run ``call``, or join the identical call already in flight."""
+        if self.flights is None:
+            return call()
+
+        return self.flights.do(key, call)
+
+
+@typechecked
+class AsyncClient(httpx.AsyncClient):
+    """HTTX based asynchronous Kraken client.
+
+    With ``coalesce``, identical public market data calls made at the same
+    time from several coroutines share one request and one parsed result.
+    With ``retry``, transient failures are retried following the policy.
+    With ``metrics``, latencies, sizes and retries are recorded per
+    endpoint, see ``okapi.metrics``.
+    """
+
+    def __init__(
+        self,
+        *,
+        key: str | None = None,
+        secret: str | None = None,
+        name: str = f"okapi/{__version__}",
+        domain: str = "https://api.kraken.com",
+        api_version: int = 0,
+        limiter: RateLimiter | None = None,
+        nonce_provider: NonceProvider = default_nonce,
+        coalesce: bool = False,
+        retry: RetryPolicy | None = None,
+        metrics: Metrics | None = None,
+        **kwargs: HTTPXClientKwargs,
+    ) -> None:
+        self.limiter = limiter
+        self.nonce_provider = nonce_provider
+        self.retry = retry
+        self.metrics = metrics
+        self.flights = AsyncSingleFlight() if coalesce else None
+        super().__init__(
+            **_client_kwargs(
+                key=key,
+                secret=secret,
+                name=name,
+                domain=domain,
+                api_version=api_version,
+                metrics=metrics,
+            ),
+            **kwargs,
+        )
+
+    async def _send_once(
+        self, request: httpx.Request, **kwargs: HTTPXClientKwargs
+    ) -> httpx.Response:
+        if self.metrics is None:
+            if self.limiter is not None:
+                await self.limiter.acquire_async(request)
+
+            return await super().send(request, **kwargs)
+
+        name = endpoint(request.url)
+        if self.limiter is not None:
+            start = time.perf_counter()
+            await self.limiter.acquire_async(request)
+            self.metrics.observe(
+                "okapi_rate_limit_seconds",
+                time.perf_counter() - start,
+                endpoint=name,
+            )
+
+        request.extensions.setdefault("trace", trace_async(self.metrics, name))
+        start = time.perf_counter()
+        response = await super().send(request, **kwargs)
+        _record(self.metrics, name, request, response, start)
+        return response
+
+    async def send(
+        self, request: httpx.Request, **kwargs: HTTPXClientKwargs
+    ) -> httpx.Response:
+        if self.retry is None:
+            return await self._send_once(request, **kwargs)
+
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            response, error = None, None
+            try:
+                response = await self._send_once(request, **kwargs)
+            except httpx.TransportError as transport_error:
+                error = transport_error
+
+            delay = self.retry.delay(
+                request,
+                attempt,
+                time.monotonic() - start,
+                response=response,
+                error=error,
+            )
+            if delay is None:
+                if error is not None:
+                    raise error
+
+                return response
+
+            if response is not None:
+                await response.aclose()
+
+            if self.metrics is not None:
+                self.metrics.increment(
+                    "okapi_retries_total", endpoint=endpoint(request.url)
+                )
+
+            await asyncio.sleep(delay)
+            request = with_fresh_nonce(request, self.nonce_provider)
+            attempt += 1
+
+    async def coalesced(
+        self, key: Hashable, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run ``call``, or join the identical call already in flight."""
+        if self.flights is None:
+            return await call()
+
+        return await self.flights.do(key, call)
@@ -0,0 +1,204 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Kraken server clock estimation and scheduling on server time."""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from typing import Callable
+
+import httpx
+
+from .api.utils import content
+from .api.utils import public_url
+from .client import AsyncClient
+from .client import Client
+from .exception import KrakenAPIError
+from .typecheck import typechecked
+
+
+@typechecked
+class ClockSync:
+    """Offset of the Kraken server clock from the local one.
+
+    Kraken reads its clock, truncated to the second, somewhere between the
+    moment a ``Time`` request is sent and the moment its response is
+    received: each request bounds the offset. As NTP does, the bounds of
+    the last ``samples`` requests are intersected, sent at different
+    fractions of a second so that together they narrow the one second
+    resolution down. ``offset`` is the middle of the intersection and
+    ``error`` its half-width; ``rtt`` is the shortest round trip.
+
+    ``start`` (threads) or ``run`` (asyncio) refresh the estimate every
+    ``refresh`` seconds, to follow the drift of the local clock. Sample
+    with a client without rate limiter nor retries: the time they spend
+    waiting counts as round trip and widens the bounds.
+    """
+
+    def __init__(
+        self,
+        *,
+        samples: int = 8,
+        refresh: float = 600.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.samples = samples
+        self.refresh = refresh
+        self.clock = clock
+        self.bounds: deque[tuple[float, float]] = deque(maxlen=samples)
+        self.offset = 0.0
+        self.error = math.inf
+        self.rtt = math.inf
+        self.updated: float | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def now(self) -> float:
+        """Current server time, in seconds since the epoch."""
+        return self.clock() + self.offset
+
+    def add_sample(self, sent: float, server: int, received: float) -> None:
+        """Bound the offset with a server time read during a request."""
+        with self._lock:
+            bound = (server - received, server + 1 - sent)
+            self.bounds.append(bound)
+            low = max(bound[0] for bound in self.bounds)
+            high = min(bound[1] for bound in self.bounds)
+            if low > high:
+                # The local clock stepped: forget the previous samples.
+                self.bounds.clear()
+                self.bounds.append(bound)
+                low, high = bound
+
+            self.offset = (low + high) / 2
+            self.error = (high - low) / 2
+            self.rtt = min(bound[1] - bound[0] for bound in self.bounds) - 1
+            self.updated = received
+
+    def _delay(self, sample: int) -> float:
+        """Seconds until the next sample is due."""
+        return (sample / self.samples - self.clock()) % 1.0
+
+    def calibrate(self, client: Client) -> None:
+        """Sample the server time ``samples`` times."""
+        for sample in range(self.samples):
+            time.sleep(self._delay(sample))
+            sent = self.clock()
+            response = client.get(url=public_url("Time"))
+            received = self.clock()
+            self.add_sample(sent, int(content(response)["unixtime"]), received)
+
+    async def calibrate_async(self, client: AsyncClient) -> None:
+        """Sample the server time ``samples`` times."""
+        for sample in range(self.samples):
+            await asyncio.sleep(self._delay(sample))
+            sent = self.clock()
+            response = await client.get(url=public_url("Time"))
+            received = self.clock()
+            self.add_sample(sent, int(content(response)["unixtime"]), received)
+
+    def _refresh(self, client: Client) -> None:
+        while not self._stop.wait(self.refresh):
+            try:
+                self.calibrate(client)
+            except (httpx.HTTPError, KrakenAPIError):
+                pass
+
+    def start(self, client: Client) -> None:
+        """Calibrate, then keep refreshing in a daemon thread."""
+        self.calibrate(client)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refresh, args=(client,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread started by ``start``."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def run(self, client: AsyncClient) -> None:
+        """Recalibrate every ``refresh`` seconds, until cancelled.
+
+        Await ``calibrate_async`` first: this only keeps the estimate fresh.
+        """
+        while True:
+            await asyncio.sleep(self.refresh)
+            try:
+                await self.calibrate_async(client)
+            except (httpx.HTTPError, KrakenAPIError):
+                pass
+
+
+@typechecked
+class IntervalScheduler:
+    """Wake up right after each interval closes on the server clock.
+
+    ``wait`` returns the server time of each boundary, a multiple of
+    ``interval`` minutes, once it has passed on the server by ``delay``
+    seconds plus the uncertainty of the clock: the candle that ended there
+    is then closed and can be fetched once. No boundary is returned twice,
+    even when the clock estimate moves back.
+    """
+
+    def __init__(
+        self, clock: ClockSync, interval: int = 1, *, delay: float = 1.0
+    ) -> None:
+        self.clock = clock
+        self.interval = interval
+        self.delay = delay
+        self.last: int | None = None
+
+    def next_close(self) -> int:
+        """Server time of the next boundary."""
+        step = self.interval * 60
+        close = (math.floor(self.clock.now()) // step + 1) * step
+        if self.last is not None and close <= self.last:
+            close = self.last + step
+
+        return close
+
+    def _timeout(self, close: int) -> float:
+        error = self.clock.error if math.isfinite(self.clock.error) else 0.0
+        wake = close - self.clock.offset + self.delay + error
+        return max(0.0, wake - self.clock.clock())
+
+    def wait(self) -> int:
+        """Sleep until the next boundary has passed and return it."""
+        close = self.next_close()
+        time.sleep(self._timeout(close))
+        self.last = close
+        return close
+
+    async def wait_async(self) -> int:
+        """Sleep until the next boundary has passed and return it."""
+        close = self.next_close()
+        await asyncio.sleep(self._timeout(close))
+        self.last = close
+        return close
+
+    def __iter__(self) -> Iterator[int]:
+        while True:
+            yield self.wait()
+
+    async def __aiter__(self) -> AsyncIterator[int]:
+        while True:
+            yield await self.wait_async()
@@ -0,0 +1,102 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Coalescing of identical concurrent calls."""
+import asyncio
+import threading
+from collections.abc import Awaitable
+from collections.abc import Hashable
+from concurrent.futures import Future
+from typing import Any
+from typing import Callable
+
+from .typecheck import typechecked
+
+
+@typechecked
+def _share(result: Any) -> Any:
+    """Shallow copy of a dict result, so that callers may pop from theirs."""
+    if isinstance(result, dict):
+        return dict(result)
+
+    return result
+
+
+@typechecked
+class SingleFlight:
+    """Run at most one call per key at a time across threads.
+
+    Threads asking for a key whose call is in flight wait for it and get
+    the same result, or the same exception, instead of calling again. A
+    dict result is shallow copied for each of them.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """Return the result of ``call``, shared with concurrent callers."""
+        with self._lock:
+            follower = self._calls.get(key)
+            if follower is None:
+                future: Future[Any] = Future()
+                self._calls[key] = future
+
+        if follower is not None:
+            return _share(follower.result())
+
+        try:
+            result = call()
+        except BaseException as error:
+            with self._lock:
+                del self._calls[key]
+
+            future.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._calls[key]
+
+        future.set_result(result)
+        return result
+
+
+@typechecked
+class AsyncSingleFlight:
+    """Run at most one call per key at a time across coroutines.
+
+    The call runs in its own task, so that cancelling the coroutine that
+    started it does not cancel it for the others. Every caller gets its own
+    shallow copy of a dict result.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self, key: Hashable, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the result of ``call``, shared with concurrent callers."""
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(call())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return _share(await asyncio.shield(task))
@@ -0,0 +1,338 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Long-running collection of OHLC candles into a ``CandleStore``.
+
+Besides the client metrics (see ``okapi.metrics``), a collector reports:
+
+* ``okapi_collector_candles_total``: candles appended to the store;
+* ``okapi_collector_errors_total``: fetches that failed;
+* ``okapi_collector_lag_seconds``: time between the close of an interval
+  on the server and the end of the cycle storing it, for every pair.
+
+All are labelled by ``interval``. ``GET /metrics`` serves them in the
+Prometheus format and ``GET /health`` a JSON summary, with the status 503
+when an interval is more than one cycle behind.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from .api.market import _decode_ohlc
+from .api.market import AsyncMarketRESTAPI
+from .client import AsyncClient
+from .clock import ClockSync
+from .clock import IntervalScheduler
+from .metrics import InMemoryMetrics
+from .ratelimit import CallCounter
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .store import CandleStore
+from .typecheck import typechecked
+
+
+_logger = logging.getLogger(__name__)
+
+_REASONS = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}
+
+
+@typechecked
+def shard(pairs: Iterable[str], workers: int) -> list[list[str]]:
+    """Split pairs into ``workers`` groups of similar size."""
+    pairs = list(pairs)
+    return [pairs[index::workers] for index in range(workers)]
+
+
+@typechecked
+class Collector:
+    """Keep the candles of many pairs and intervals up to date in a store.
+
+    One task per interval wakes up when it closes on the server clock and
+    fetches the candles of every pair after its stored cursor, at most
+    ``concurrency`` at a time. The first cycle catches up with whatever the
+    store misses. Requests share the client, and so its rate limiter: size
+    ``concurrency`` to cover the latency, the limiter sets the pace. A
+    pair that fails is logged and counted, and retried the next cycle.
+
+    The clock is calibrated with ``clock_client``, the client of ``market``
+    by default. Give one without rate limiter: the time spent waiting for
+    it would widen the bounds of the estimate.
+    """
+
+    def __init__(
+        self,
+        market: AsyncMarketRESTAPI,
+        store: CandleStore,
+        pairs: Iterable[str],
+        intervals: Iterable[int] = (1,),
+        *,
+        clock: ClockSync | None = None,
+        clock_client: AsyncClient | None = None,
+        delay: float = 1.0,
+        concurrency: int = 4,
+        metrics: InMemoryMetrics | None = None,
+    ) -> None:
+        intervals = tuple(intervals)
+        for interval in intervals:
+            market._check_interval(interval)
+
+        self.market = market
+        self.store = store
+        self.pairs = list(pairs)
+        self.intervals = intervals
+        self.clock = clock or ClockSync()
+        self.clock_client = clock_client or market.client
+        self.delay = delay
+        self.concurrency = concurrency
+        self.metrics = metrics if metrics is not None else InMemoryMetrics()
+        self.closes: dict[int, int] = {}
+        self.lags: dict[int, float] = {}
+        self.errors = 0
+        self._slots: asyncio.Semaphore | None = None
+
+    async def fetch(self, pair: str, interval: int) -> int:
+        """Append the candles after the stored cursor of a pair.
+
+        Returns the number of new candles.
+        """
+        response = await self.market.ohlc_data(
+            pair,
+            interval=interval,
+            since=self.store.last(pair, interval),
+            raw=True,
+        )
+        pairs, last = _decode_ohlc(response)
+        (columns,) = pairs.values()
+        return await asyncio.to_thread(
+            self.store.append, pair, interval, columns, last
+        )
+
+    async def _fetch(self, pair: str, interval: int) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+
+        async with self._slots:
+            try:
+                added = await self.fetch(pair, interval)
+            except Exception:  # pylint: disable=broad-except
+                _logger.exception("Failed to collect %s (%d)", pair, interval)
+                self.errors += 1
+                self.metrics.increment(
+                    "okapi_collector_errors_total", interval=str(interval)
+                )
+                return
+
+        self.metrics.increment(
+            "okapi_collector_candles_total", added, interval=str(interval)
+        )
+
+    async def cycle(self, interval: int, close: int) -> None:
+        """Fetch every pair once the interval ending at ``close`` closed."""
+        await asyncio.gather(
+            *(self._fetch(pair, interval) for pair in self.pairs)
+        )
+        lag = self.clock.now() - close
+        self.closes[interval] = close
+        self.lags[interval] = lag
+        self.metrics.observe(
+            "okapi_collector_lag_seconds", lag, interval=str(interval)
+        )
+
+    async def collect(self, interval: int) -> None:
+        """Run the cycles of an interval, until cancelled."""
+        scheduler = IntervalScheduler(self.clock, interval, delay=self.delay)
+        await self.cycle(interval, scheduler.next_close() - interval * 60)
+        async for close in scheduler:
+            await self.cycle(interval, close)
+
+    def health(self) -> dict[str, Any]:
+        """Last close stored and lag of each interval."""
+        now = self.clock.now()
+        intervals = {
+            str(interval): {
+                "close": self.closes.get(interval),
+                "lag": self.lags.get(interval),
+            }
+            for interval in self.intervals
+        }
+        healthy = all(
+            interval in self.closes
+            and now - self.closes[interval] < 2 * interval * 60 + self.delay
+            for interval in self.intervals
+        )
+        return {
+            "healthy": healthy,
+            "pairs": len(self.pairs),
+            "errors": self.errors,
+            "offset": self.clock.offset,
+            "intervals": intervals,
+        }
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        line = request.split(b"\r\n", 1)[0].decode(errors="replace")
+        path = (line.split(" ") + [""])[1]
+        if path == "/metrics":
+            status, kind = 200, "text/plain; version=0.0.4"
+            body = self.metrics.render().encode()
+        elif path == "/health":
+            health = self.health()
+            status = 200 if health["healthy"] else 503
+            kind = "application/json"
+            body = json.dumps(health).encode()
+        else:
+            status, kind, body = 404, "text/plain", b"not found\n"
+
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: {kind}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+        writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> Any:
+        """Start serving ``/metrics`` and ``/health``, return the server."""
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def run(
+        self, *, host: str = "127.0.0.1", port: int | None = None
+    ) -> None:
+        """Calibrate the clock and collect every interval, until cancelled.
+
+        The health and metrics endpoints are served on ``port``, if given.
+        """
+        await self.clock.calibrate_async(self.clock_client)
+        server = None if port is None else await self.serve(host, port)
+        try:
+            await asyncio.gather(
+                self.clock.run(self.clock_client),
+                *(self.collect(interval) for interval in self.intervals),
+            )
+        finally:
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+
+
+@typechecked
+async def collect(
+    root: str | Path,
+    pairs: Iterable[str],
+    intervals: Iterable[int] = (1,),
+    *,
+    rate: float = 1.0,
+    host: str = "127.0.0.1",
+    port: int | None = None,
+    **options: Any,
+) -> None:
+    """Collect candles with a client of its own, until cancelled.
+
+    The client makes at most ``rate`` public calls per second on average,
+    besides the few calls of the clock calibration. ``options`` are given
+    to ``Collector``.
+    """
+    metrics = InMemoryMetrics()
+    limiter = RateLimiter(public=CallCounter(maximum=1.0, decay=rate))
+    async with AsyncClient(
+        limiter=limiter, retry=RetryPolicy(), metrics=metrics
+    ) as client, AsyncClient() as clock_client:
+        collector = Collector(
+            AsyncMarketRESTAPI(client),
+            CandleStore(root),
+            pairs,
+            intervals,
+            clock_client=clock_client,
+            metrics=metrics,
+            **options,
+        )
+        await collector.run(host=host, port=port)
+
+
+@typechecked
+def _collect_shard(
+    root: str | Path,
+    pairs: list[str],
+    intervals: tuple[int, ...],
+    **options: Any,
+) -> None:
+    try:
+        asyncio.run(collect(root, pairs, intervals, **options))
+    except KeyboardInterrupt:
+        pass
+
+
+@typechecked
+def collect_sharded(
+    root: str | Path,
+    pairs: Iterable[str],
+    intervals: Iterable[int] = (1,),
+    *,
+    workers: int = 1,
+    rate: float = 1.0,
+    port: int | None = None,
+    **options: Any,
+) -> None:
+    """Collect candles with the pairs split across ``workers`` processes.
+
+    Every process gets an equal share of the ``rate`` budget of the IP and
+    serves its endpoints on ``port`` plus its index. With one worker, the
+    collection runs in this process. Runs until interrupted.
+    """
+    intervals = tuple(intervals)
+    if workers == 1:
+        _collect_shard(
+            root,
+            list(pairs),
+            intervals,
+            rate=rate,
+            port=port,
+            **options,
+        )
+        return
+
+    processes = [
+        multiprocessing.Process(
+            target=_collect_shard,
+            args=(root, group, intervals),
+            kwargs={
+                "rate": rate / workers,
+                "port": None if port is None else port + index,
+                **options,
+            },
+        )
+        for index, group in enumerate(shard(pairs, workers))
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
@@ -12,9 +12,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Kraken module for exceptions."""
-from typeguard import typechecked
+from .typecheck import typechecked
 
 
 @typechecked
 class KrakenAPIError(Exception):
     """Kraken API Error."""
+
+
+@typechecked
+class KrakenRetryableError(KrakenAPIError):
+    """Transient Kraken API error: the request was not processed."""
+
+
+@typechecked
+class KrakenServiceError(KrakenRetryableError):
+    """Kraken API unavailable or busy."""
+
+
+@typechecked
+class KrakenRateLimitError(KrakenRetryableError):
+    """Kraken API rate limit exceeded."""
+
+
+@typechecked
+class KrakenNonceError(KrakenRetryableError):
+    """Kraken API nonce not greater than the last one seen."""
+
+
+@typechecked
+class KrakenAuthenticationError(KrakenAPIError):
+    """Kraken API key, signature or permissions rejected."""
+
+
+@typechecked
+class KrakenInvalidArgumentsError(KrakenAPIError):
+    """Kraken API request with invalid arguments."""
+
+
+@typechecked
+class KrakenChecksumError(KrakenAPIError):
+    """Kraken order book checksum mismatch."""
+
+
+KRAKEN_ERRORS = (
+    ("EService:", KrakenServiceError),
+    ("EAPI:Rate limit exceeded", KrakenRateLimitError),
+    ("EGeneral:Too many requests", KrakenRateLimitError),
+    ("EOrder:Rate limit exceeded", KrakenRateLimitError),
+    ("EAPI:Invalid nonce", KrakenNonceError),
+    ("EAPI:Invalid key", KrakenAuthenticationError),
+    ("EAPI:Invalid signature", KrakenAuthenticationError),
+    ("EGeneral:Permission denied", KrakenAuthenticationError),
+    ("EGeneral:Invalid arguments", KrakenInvalidArgumentsError),
+)
+
+
+@typechecked
+def kraken_error(errors: list[str]) -> KrakenAPIError:
+    """Exception of the class matching the first known Kraken error."""
+    for error in errors:
+        for prefix, error_class in KRAKEN_ERRORS:
+            if error.startswith(prefix):
+                return error_class(errors)
+
+    return KrakenAPIError(errors)
@@ -0,0 +1,237 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Instrumentation of the Kraken clients.
+
+A client given ``metrics`` reports, labelled by ``endpoint`` (``OHLC``,
+``Balance``, ...):
+
+* ``okapi_request_seconds``: duration of each attempt, body included;
+* ``okapi_phase_seconds``: the same split by ``phase``, ``connect``
+  (DNS and TCP), ``tls``, ``send``, ``wait`` (for the response headers)
+  and ``receive`` (the body), when the transport reports them;
+* ``okapi_rate_limit_seconds``: time spent waiting for the rate limiter;
+* ``okapi_sign_seconds``: time spent signing private requests;
+* ``okapi_parse_seconds``: decoding and building the parsed result;
+* ``okapi_request_bytes_total`` and ``okapi_response_bytes_total``;
+* ``okapi_retries_total``.
+
+Without ``metrics`` (the default) none of this is measured.
+"""
+import bisect
+import threading
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Protocol
+from typing import runtime_checkable
+
+from .typecheck import typechecked
+
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http11.receive_response_headers": "wait",
+    "http11.receive_response_body": "receive",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http2.receive_response_headers": "wait",
+    "http2.receive_response_body": "receive",
+}
+Labels = tuple[tuple[str, str], ...]
+
+
+@runtime_checkable
+class Metrics(Protocol):
+    """Recorder of okapi measurements."""
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in the histogram ``name``."""
+
+    def increment(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add a value to the counter ``name``."""
+
+
+@typechecked
+def endpoint(url: Any) -> str:
+    """Kraken method called by a URL, e.g. ``OHLC``."""
+    return str(url.path).rsplit("/", 1)[-1]
+
+
+@typechecked
+class _PhaseTimer:
+    """Time the phases reported by the transport trace extension."""
+
+    def __init__(self, metrics: Metrics, name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+        self._started: dict[str, float] = {}
+
+    def event(self, event: str) -> None:
+        step, _, state = event.rpartition(".")
+        phase = PHASES.get(step)
+        if phase is None:
+            return
+
+        if state == "started":
+            self._started[step] = time.perf_counter()
+        elif step in self._started:
+            self.metrics.observe(
+                "okapi_phase_seconds",
+                time.perf_counter() - self._started.pop(step),
+                endpoint=self.name,
+                phase=phase,
+            )
+
+
+@typechecked
+def trace(metrics: Metrics, name: str) -> Callable[[str, Any], None]:
+    """Callback for the ``trace`` request extension of the sync client."""
+    timer = _PhaseTimer(metrics, name)
+
+    def callback(event: str, info: Any) -> None:
+        timer.event(event)
+
+    return callback
+
+
+@typechecked
+def trace_async(
+    metrics: Metrics, name: str
+) -> Callable[[str, Any], Awaitable[None]]:
+    """Callback for the ``trace`` request extension of the async client."""
+    timer = _PhaseTimer(metrics, name)
+
+    async def callback(event: str, info: Any) -> None:
+        timer.event(event)
+
+    return callback
+
+
+@typechecked
+@dataclass
+class Histogram:
+    """Cumulative histogram, as exposed by Prometheus."""
+
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Add a value."""
+        for i in range(
+            bisect.bisect_left(self.buckets, value), len(self.buckets)
+        ):
+            self.counts[i] += 1
+
+        self.total += value
+        self.count += 1
+
+
+@typechecked
+def _labels(labels: Labels, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+
+    text = ",".join(f'{key}="{value}"' for key, value in pairs)
+    return "{" + text + "}"
+
+
+@typechecked
+class InMemoryMetrics:
+    """Thread-safe in-memory collector, rendered in the Prometheus format.
+
+    Serve ``render()`` on a ``/metrics`` endpoint to have Prometheus scrape
+    it, or inspect ``counters`` and ``histograms`` in tests.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value in the histogram ``name``."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add a value to the counter ``name``."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def render(self) -> str:
+        """Every series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            previous = None
+            for (name, labels), value in sorted(self.counters.items()):
+                if name != previous:
+                    lines.append(f"# TYPE {name} counter")
+                    previous = name
+
+                lines.append(f"{name}{_labels(labels)} {value}")
+
+            for (name, labels), histogram in sorted(
+                self.histograms.items(), key=lambda item: item[0]
+            ):
+                if name != previous:
+                    lines.append(f"# TYPE {name} histogram")
+                    previous = name
+
+                bounds = [*map(str, histogram.buckets), "+Inf"]
+                counts = [*histogram.counts, histogram.count]
+                for bound, count in zip(bounds, counts):
+                    lines.append(
+                        f"{name}_bucket{_labels(labels, le=bound)} {count}"
+                    )
+
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.total}")
+                lines.append(
+                    f"{name}_count{_labels(labels)} {histogram.count}"
+                )
+
+        return "\n".join(lines) + "\n"
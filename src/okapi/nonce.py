@@ -0,0 +1,130 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Nonce providers for the Kraken private API.
+
+Kraken rejects a private request whose nonce is not greater than the last
+one seen for the same API key. Every provider here counts nanoseconds since
+the epoch, so nonces keep increasing across restarts and hosts with
+synchronized clocks, and never returns the same value twice.
+
+references:
+    * https://support.kraken.com/hc/en-us/articles/360000906023-What-is-a-nonce-
+"""  # pylint: disable=line-too-long
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+from .typecheck import typechecked
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+
+NonceProvider = Callable[[], int]
+
+
+@typechecked
+class EpochNonce:
+    """Strictly increasing nonces within a process."""
+
+    def __init__(self) -> None:
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            self._last = max(time.time_ns(), self._last + 1)
+            return self._last
+
+
+@typechecked
+class SharedMemoryNonce:
+    """Strictly increasing nonces shared by forked worker processes.
+
+    Create it in the parent process before starting the pool: the counter
+    lives in shared memory and is protected by a process-shared lock.
+    """
+
+    def __init__(self, context: Any = None) -> None:
+        context = context or multiprocessing.get_context()
+        self._last = context.Value("q", 0)
+
+    def __call__(self) -> int:
+        with self._last.get_lock():
+            self._last.value = max(time.time_ns(), self._last.value + 1)
+            return int(self._last.value)
+
+
+@typechecked
+class FileLockNonce:
+    """Strictly increasing nonces shared through a locked file.
+
+    Unrelated processes using the same file (for instance several services
+    sharing one API key on a host) never issue the same or a smaller nonce.
+    The file is opened again in a forked process: locks taken on a shared
+    file description would not exclude each other.
+    """
+
+    _format = struct.Struct("<q")
+
+    def __init__(self, path: str | Path) -> None:
+        if fcntl is None:  # pragma: no cover
+            raise RuntimeError("FileLockNonce requires fcntl (POSIX).")
+
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._fd: int | None = None
+        self._pid: int | None = None
+
+    def _file(self) -> int:
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+
+        return self._fd
+
+    def __call__(self) -> int:
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                stored = os.pread(fd, self._format.size, 0)
+                last = (
+                    self._format.unpack(stored)[0]
+                    if len(stored) == self._format.size
+                    else 0
+                )
+                value = max(time.time_ns(), last + 1)
+                os.pwrite(fd, self._format.pack(value), 0)
+                return value
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Close the underlying file, if this process opened it."""
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+
+            self._fd = None
+
+
+default_nonce = EpochNonce()
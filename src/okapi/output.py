@@ -0,0 +1,140 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Streaming output of DataFrames for the command-line interface.
+
+This module does not import pandas, so that the CLI can declare its
+options without it. The ``parquet`` and ``arrow`` formats require the
+optional ``pyarrow`` dependency (``pip install okapi[arrow]``).
+"""
+from typing import Any
+from typing import BinaryIO
+
+from .typecheck import typechecked
+
+
+FORMATS = ("text", "csv", "ndjson", "parquet", "arrow")
+DataFrame = Any
+
+
+@typechecked
+def _pyarrow() -> Any:
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as error:  # pragma: no cover
+        raise ImportError(
+            "parquet and arrow output require pyarrow: "
+            "pip install okapi[arrow]"
+        ) from error
+
+    return pyarrow
+
+
+@typechecked
+def _plain(frame: DataFrame) -> DataFrame:
+    """Frame whose array cells, e.g. fee schedules, become nested lists."""
+    columns = [
+        name
+        for name, column in frame.items()
+        if column.dtype == object
+        and any(hasattr(cell, "tolist") for cell in column)
+    ]
+    if not columns:
+        return frame
+
+    plain = frame.copy(deep=False)
+    for name in columns:
+        plain[name] = frame[name].map(
+            lambda cell: cell.tolist() if hasattr(cell, "tolist") else cell
+        )
+
+    return plain
+
+
+@typechecked
+class FrameWriter:
+    """Write DataFrames to a binary stream, one batch at a time.
+
+    Frames are written as they are given, in slices of at most
+    ``batch_size`` rows, so that memory stays bounded whatever the total
+    number of rows. Every frame must have the same columns. The index is
+    not written: reset it first to keep it. Array cells are written as
+    nested lists. ``text`` prints the pandas representation of each frame,
+    for humans.
+    """
+
+    def __init__(
+        self, out: BinaryIO, fmt: str = "csv", *, batch_size: int = 65536
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"{fmt} not in valid formats {FORMATS}.")
+
+        self.out = out
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.rows = 0
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _write_batch(self, batch: DataFrame) -> None:
+        if self.fmt == "csv":
+            text = batch.to_csv(index=False, header=self.rows == 0)
+            self.out.write(text.encode())
+        elif self.fmt == "ndjson":
+            text = batch.to_json(
+                orient="records", lines=True, date_format="iso"
+            )
+            self.out.write(text.encode())
+        else:
+            pyarrow = _pyarrow()
+            table = pyarrow.Table.from_pandas(
+                batch, schema=self._schema, preserve_index=False
+            )
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = (
+                    pyarrow.parquet.ParquetWriter(self.out, table.schema)
+                    if self.fmt == "parquet"
+                    else pyarrow.ipc.new_stream(self.out, table.schema)
+                )
+
+            self._writer.write_table(table)
+
+        self.rows += len(batch)
+
+    def write(self, frame: DataFrame) -> None:
+        """Write the rows of a frame."""
+        if self.fmt == "text":
+            self.out.write(f"{frame.to_string()}\n".encode())
+            self.rows += len(frame)
+            return
+
+        frame = _plain(frame)
+        for start in range(0, len(frame), self.batch_size):
+            self._write_batch(frame.iloc[start : start + self.batch_size])
+
+    def close(self) -> None:
+        """Finish the output, writing the footer of parquet files."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        self.out.flush()
@@ -0,0 +1,143 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Client-side rate limiting for the Kraken API."""
+import asyncio
+import threading
+import time
+
+import httpx
+
+from .typecheck import typechecked
+
+
+PRIVATE_TIERS = {
+    "starter": (15.0, 0.33),
+    "intermediate": (20.0, 0.5),
+    "pro": (20.0, 1.0),
+}
+ENDPOINT_COSTS = {
+    "Ledgers": 2.0,
+    "QueryLedgers": 2.0,
+    "TradesHistory": 2.0,
+    "AddOrder": 0.0,
+    "AddOrderBatch": 0.0,
+    "EditOrder": 0.0,
+    "CancelOrder": 0.0,
+    "CancelOrderBatch": 0.0,
+    "CancelAll": 0.0,
+}
+
+
+@typechecked
+class CallCounter:
+    """Kraken call counter with a linear decay.
+
+    Every call adds its cost to the counter, which decreases by ``decay``
+    every second. A call that would push the counter above ``maximum`` is
+    delayed until enough of it has decayed, in the order the calls were made.
+
+    references:
+        * https://docs.kraken.com/rest/#section/Rate-Limits
+    """
+
+    def __init__(self, maximum: float, decay: float) -> None:
+        if maximum <= 0 or decay <= 0:
+            raise ValueError("maximum and decay must be positive.")
+
+        self.maximum = maximum
+        self.decay = decay
+        self._counter = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def counter(self) -> float:
+        """Current value of the counter, including queued calls."""
+        with self._lock:
+            return self._decayed(time.monotonic())
+
+    def _decayed(self, now: float) -> float:
+        elapsed = now - self._updated
+        return max(0.0, self._counter - elapsed * self.decay)
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Book a call and return the number of seconds to wait before it."""
+        with self._lock:
+            now = time.monotonic()
+            self._counter = self._decayed(now) + cost
+            self._updated = now
+            return max(0.0, (self._counter - self.maximum) / self.decay)
+
+    def acquire(self, cost: float = 1.0) -> None:
+        """Block until a call of the given cost fits in the budget."""
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, cost: float = 1.0) -> None:
+        """Wait until a call of the given cost fits in the budget."""
+        delay = self.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@typechecked
+class RateLimiter:
+    """Kraken REST rate limiter.
+
+    Public endpoints share a per-IP budget, private endpoints share the
+    per-API-key call counter whose size and decay depend on the
+    verification tier. Order placement and cancellation are rate limited
+    by the matching engine instead and cost nothing here.
+    """
+
+    def __init__(
+        self,
+        *,
+        tier: str = "starter",
+        public: CallCounter | None = None,
+        private: CallCounter | None = None,
+        costs: dict[str, float] | None = None,
+    ) -> None:
+        if tier not in PRIVATE_TIERS:
+            raise ValueError(
+                f"tier {tier} not in valid tiers {tuple(PRIVATE_TIERS)}."
+            )
+
+        if public is None:
+            public = CallCounter(maximum=1.0, decay=1.0)
+
+        if private is None:
+            private = CallCounter(*PRIVATE_TIERS[tier])
+
+        self.public = public
+        self.private = private
+        self.costs = {**ENDPOINT_COSTS, **(costs or {})}
+
+    def _budget(self, request: httpx.Request) -> tuple[CallCounter, float]:
+        *_, scope, method = request.url.path.rsplit("/", 2)
+        counter = self.private if scope == "private" else self.public
+        return counter, self.costs.get(method, 1.0)
+
+    def acquire(self, request: httpx.Request) -> None:
+        """Block until the request fits in its budget."""
+        counter, cost = self._budget(request)
+        if cost > 0:
+            counter.acquire(cost)
+
+    async def acquire_async(self, request: httpx.Request) -> None:
+        """Wait until the request fits in its budget."""
+        counter, cost = self._budget(request)
+        if cost > 0:
+            await counter.acquire_async(cost)
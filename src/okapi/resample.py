@@ -0,0 +1,147 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local OHLC resampling from finer candles."""
+import numpy as np
+import pandas as pd
+
+from .api.history import _ohlc_frame
+from .api.history import Columns
+from .api.history import OHLC_DTYPES
+from .typecheck import typechecked
+
+
+@typechecked
+def _check_intervals(base: int, interval: int) -> None:
+    if base <= 0 or interval <= 0 or interval % base != 0:
+        raise ValueError(
+            f"interval {interval} is not a multiple of the base interval "
+            f"{base}."
+        )
+
+
+@typechecked
+def _empty() -> Columns:
+    return {
+        name: np.empty(0, dtype=dtype) for name, dtype in OHLC_DTYPES.items()
+    }
+
+
+@typechecked
+def resample_ohlc(
+    columns: Columns, *, base: int = 1, interval: int, origin: int = 0
+) -> Columns:
+    """Aggregate candles of ``base`` minutes into ``interval`` minutes.
+
+    ``interval`` is any multiple of ``base``, including intervals Kraken
+    does not serve (3, 120, ...). Candles are bucketed on multiples of the
+    interval since ``origin`` (the epoch by default, as Kraken does). Open
+    and close come from the first and last candle of each bucket, the vwap
+    is weighted by volume and falls back to the close when nothing traded.
+    ``columns`` must be sorted by time, as returned by the store and the
+    backfill engine.
+    """
+    _check_intervals(base, interval)
+    time = columns["time"]
+    if len(time) == 0:
+        return _empty()
+
+    seconds = 60 * interval
+    bucket = (time - origin) // seconds
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    stops = np.r_[starts[1:], len(time)] - 1
+    volume = np.add.reduceat(columns["volume"], starts)
+    close = columns["close"][stops]
+    traded = np.add.reduceat(columns["vwap"] * columns["volume"], starts)
+    vwap = np.divide(traded, volume, out=close.copy(), where=volume > 0)
+    return {
+        "time": bucket[starts] * seconds + origin,
+        "open": columns["open"][starts],
+        "high": np.maximum.reduceat(columns["high"], starts),
+        "low": np.minimum.reduceat(columns["low"], starts),
+        "close": close,
+        "vwap": vwap,
+        "volume": volume,
+        "count": np.add.reduceat(columns["count"], starts),
+    }
+
+
+@typechecked
+def resample_frame(
+    ohlc: pd.DataFrame, *, base: int = 1, interval: int, origin: int = 0
+) -> pd.DataFrame:
+    """Aggregate an OHLC DataFrame of ``base`` minutes candles."""
+    columns = {
+        name: ohlc[name].to_numpy(dtype=dtype)
+        for name, dtype in OHLC_DTYPES.items()
+    }
+    return _ohlc_frame(
+        resample_ohlc(columns, base=base, interval=interval, origin=origin)
+    )
+
+
+@typechecked
+class OHLCResampler:
+    """Incrementally aggregate base candles as they arrive.
+
+    Base candles of the bucket in progress are kept aside; a bucket is
+    emitted once a base candle of a later bucket arrives. A base candle
+    received again (Kraken revises the last candle until its interval
+    closes) replaces the previous version, and candles of buckets already
+    emitted are ignored.
+    """
+
+    def __init__(
+        self, *, base: int = 1, interval: int, origin: int = 0
+    ) -> None:
+        _check_intervals(base, interval)
+        self.base = base
+        self.interval = interval
+        self.origin = origin
+        self._pending = _empty()
+        self._emitted = np.iinfo(np.int64).min
+
+    def update(self, columns: Columns) -> Columns:
+        """Add base candles and return the buckets they completed."""
+        fresh = columns["time"] >= self._emitted
+        columns = {name: column[fresh] for name, column in columns.items()}
+        time = columns["time"]
+        if len(time) == 0:
+            return _empty()
+
+        keep = self._pending["time"] < time[0]
+        merged = {
+            name: np.concatenate([pending[keep], columns[name]])
+            for name, pending in self._pending.items()
+        }
+        bucket = (merged["time"] - self.origin) // (60 * self.interval)
+        done = bucket < bucket[-1]
+        self._pending = {
+            name: column[~done] for name, column in merged.items()
+        }
+        self._emitted = int(bucket[-1]) * 60 * self.interval + self.origin
+        return resample_ohlc(
+            {name: column[done] for name, column in merged.items()},
+            base=self.base,
+            interval=self.interval,
+            origin=self.origin,
+        )
+
+    def current(self) -> Columns:
+        """The bucket in progress, aggregated from the base candles so far."""
+        return resample_ohlc(
+            self._pending,
+            base=self.base,
+            interval=self.interval,
+            origin=self.origin,
+        )
@@ -0,0 +1,153 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Retry of transient Kraken API failures."""
+import random
+import urllib.parse
+from dataclasses import dataclass
+
+import httpx
+
+from .exception import kraken_error
+from .exception import KrakenRetryableError
+from .nonce import NonceProvider
+from .typecheck import typechecked
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504, 520, 522, 524)
+UNSAFE_METHODS = (
+    "AddOrder",
+    "AddOrderBatch",
+    "EditOrder",
+    "Withdraw",
+    "WalletTransfer",
+    "Stake",
+    "Unstake",
+)
+
+
+@typechecked
+def _rejected(response: httpx.Response) -> bool:
+    """Whether the body holds a Kraken error worth retrying."""
+    try:
+        head = response.content[:16]
+    except httpx.ResponseNotRead:
+        return False
+
+    # Skip decoding the (possibly large) body of successful responses.
+    if head.startswith((b'{"error":[]', b'{"error": []')):
+        return False
+
+    try:
+        errors = response.json()["error"]
+    except (ValueError, KeyError, TypeError):
+        return False
+
+    return isinstance(kraken_error(errors), KrakenRetryableError)
+
+
+@typechecked
+def with_fresh_nonce(
+    request: httpx.Request, provider: NonceProvider
+) -> httpx.Request:
+    """Copy of a private request with a new nonce, to be signed again."""
+    if "nonce" not in request.extensions:
+        return request
+
+    nonce = str(provider())
+    data = dict(urllib.parse.parse_qsl(request.content.decode()))
+    data["nonce"] = nonce
+    headers = {
+        name: value
+        for name, value in request.headers.items()
+        if name not in ("content-length", "content-type", "api-sign")
+    }
+    return httpx.Request(
+        request.method,
+        request.url,
+        headers=headers,
+        data=data,
+        extensions={**request.extensions, "nonce": nonce},
+    )
+
+
+@typechecked
+@dataclass
+class RetryPolicy:
+    """Retry transient failures with exponential backoff and full jitter.
+
+    Kraken errors of ``KrakenRetryableError`` (service unavailable or busy,
+    rate limits, invalid nonces), the HTTP ``statuses`` and network errors
+    are retried, at most ``attempts`` times in all and never past
+    ``deadline`` seconds after the first attempt. A private request gets a
+    fresh nonce, and so a new signature, before each retry.
+
+    The ``unsafe`` private methods (placing orders, moving funds) are only
+    retried when Kraken says it rejected them: after a timeout or a gateway
+    error, the first attempt may have gone through.
+    """
+
+    attempts: int = 5
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    deadline: float | None = 30.0
+    statuses: tuple[int, ...] = RETRY_STATUSES
+    unsafe: tuple[str, ...] = UNSAFE_METHODS
+
+    def _retryable(
+        self,
+        request: httpx.Request,
+        response: httpx.Response | None,
+        error: Exception | None,
+    ) -> bool:
+        if response is not None and _rejected(response):
+            return True
+
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            return True
+
+        if request.url.path.rsplit("/", 1)[-1] in self.unsafe:
+            return False
+
+        if response is not None:
+            return response.status_code in self.statuses
+
+        return isinstance(error, httpx.TransportError)
+
+    def delay(
+        self,
+        request: httpx.Request,
+        attempt: int,
+        elapsed: float,
+        *,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """Seconds to wait before retrying, or None to give up.
+
+        ``attempt`` counts the attempts made so far and ``elapsed`` the
+        seconds since the first one.
+        """
+        if attempt >= self.attempts:
+            return None
+
+        if not self._retryable(request, response, error):
+            return None
+
+        delay = random.uniform(  # noqa: S311  # nosec
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+
+        return delay
@@ -0,0 +1,161 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local on-disk OHLC candle store."""
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .api.history import _ohlc_frame
+from .api.history import Columns
+from .api.history import OHLC_DTYPES
+from .api.history import OHLCBackfill
+from .api.market import _make_pair
+from .api.market import CompactOHLC
+from .api.market import MarketRESTAPI
+from .api.market import Pair
+from .resample import resample_ohlc
+from .typecheck import typechecked
+
+
+@typechecked
+class CandleStore:
+    """Append-only OHLC candle store keyed by (pair, interval).
+
+    Each column lives in its own raw little-endian file under
+    ``root/<pair>/<interval>/`` next to a ``meta.json`` holding the number
+    of committed candles and the ``last`` cursor. Columns are read back as
+    read-only memory maps, so other processes can share the store without
+    copying it: column files only grow, candles are written in place and
+    ``meta.json`` commits them.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, pair: Pair, interval: int) -> Path:
+        return self.root / _make_pair(pair).replace("/", "_") / str(interval)
+
+    def _meta(self, path: Path) -> dict[str, int | None]:
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            return {"rows": 0, "last": None}
+
+        return json.loads(meta_path.read_text())
+
+    def _commit(self, path: Path, rows: int, last: int | None) -> None:
+        meta_path = path / "meta.json"
+        tmp_path = meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"rows": rows, "last": last}))
+        os.replace(tmp_path, meta_path)
+
+    def last(self, pair: Pair, interval: int) -> int | None:
+        """Stored ``last`` cursor for a pair and interval."""
+        return self._meta(self._path(pair, interval))["last"]
+
+    def columns(self, pair: Pair, interval: int) -> Columns:
+        """Read-only memory maps on the committed candles."""
+        path = self._path(pair, interval)
+        rows = self._meta(path)["rows"]
+        if not rows:
+            return {
+                name: np.empty(0, dtype=dtype)
+                for name, dtype in OHLC_DTYPES.items()
+            }
+
+        return {
+            name: np.memmap(
+                path / f"{name}.bin",
+                dtype=np.dtype(dtype).newbyteorder("<"),
+                mode="r",
+                shape=(rows,),
+            )
+            for name, dtype in OHLC_DTYPES.items()
+        }
+
+    def read(
+        self, pair: Pair, interval: int, *, compact: CompactOHLC | None = None
+    ) -> pd.DataFrame:
+        """Stored candles as a DataFrame indexed by candle time.
+
+        With ``compact``, the frame is built with its dtypes instead.
+        """
+        columns = self.columns(pair, interval)
+        if compact is not None:
+            return compact.frame(columns)
+
+        return _ohlc_frame(columns)
+
+    def resample(
+        self, pair: Pair, interval: int, *, base: int = 1
+    ) -> pd.DataFrame:
+        """Candles of ``interval`` minutes built from stored ``base`` ones."""
+        return _ohlc_frame(
+            resample_ohlc(
+                self.columns(pair, base), base=base, interval=interval
+            )
+        )
+
+    def append(
+        self, pair: Pair, interval: int, columns: Columns, last: int
+    ) -> int:
+        """Append candles newer than the stored ones.
+
+        The most recent stored candle is replaced when it comes again, since
+        it may have been saved before its interval closed. Returns the number
+        of new candles.
+        """
+        path = self._path(pair, interval)
+        path.mkdir(parents=True, exist_ok=True)
+        committed = self._meta(path)["rows"]
+        assert committed is not None  # noqa: S101  # nosec
+        rows = committed
+        time = columns["time"]
+        first = 0
+        if rows > 0:
+            stored = self.columns(pair, interval)["time"]
+            last_time = int(stored[-1])
+            first = int(np.searchsorted(time, last_time))
+            if first < len(time) and time[first] == last_time:
+                rows -= 1
+
+        for name, dtype in OHLC_DTYPES.items():
+            dtype = np.dtype(dtype).newbyteorder("<")
+            column_path = path / f"{name}.bin"
+            column_path.touch()
+            with open(column_path, "r+b") as column:
+                column.seek(rows * dtype.itemsize)
+                column.write(columns[name][first:].astype(dtype).tobytes())
+
+        rows += len(time) - first
+        self._commit(path, rows, last)
+        return rows - committed
+
+    def sync(
+        self, market: MarketRESTAPI, pair: Pair, *, interval: int = 1
+    ) -> pd.DataFrame:
+        """Fetch the candles after the stored cursor and return all of them."""
+        backfill = OHLCBackfill(
+            market,
+            pair,
+            interval=interval,
+            since=self.last(pair, interval),
+        )
+        for page in backfill.pages():
+            assert backfill.since is not None  # noqa: S101  # nosec
+            self.append(pair, interval, page, backfill.since)
+
+        return self.read(pair, interval)
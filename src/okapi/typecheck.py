@@ -0,0 +1,43 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Optional runtime type checking.
+
+Okapi functions and classes are decorated with :func:`typechecked`, which
+only applies :func:`typeguard.typechecked` when the ``OKAPI_TYPECHECK``
+environment variable is set to ``1``, ``true``, ``yes`` or ``on`` at import
+time. Leave it unset in production to skip the per-call overhead and set
+it in debug and test runs.
+"""
+import os
+from typing import TypeVar
+
+import typeguard
+
+
+T = TypeVar("T")
+
+ENABLED = os.environ.get("OKAPI_TYPECHECK", "").lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+
+
+def typechecked(obj: T) -> T:
+    """Apply typeguard runtime checks when they are enabled."""
+    if ENABLED:
+        return typeguard.typechecked(obj)  # type: ignore
+
+    return obj
@@ -0,0 +1,305 @@
+# Copyright 2022 Romain Brault
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Kraken WebSocket market data client.
+
+Requires the optional ``websockets`` dependency (``pip install
+okapi[websocket]``).
+"""
+import bisect
+import json
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from .exception import KrakenAPIError
+from .exception import KrakenChecksumError
+from .typecheck import typechecked
+
+
+WS_URL = "wss://ws.kraken.com"
+Level = list[str]
+
+
+@typechecked
+def _checksum_part(value: str) -> str:
+    return value.replace(".", "").lstrip("0")
+
+
+@typechecked
+class _BookSide:
+    """Price levels of one side of a book, sorted by ascending price."""
+
+    def __init__(self, *, descending: bool) -> None:
+        self.descending = descending
+        self.prices: list[float] = []
+        self.levels: dict[float, tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def clear(self) -> None:
+        self.prices.clear()
+        self.levels.clear()
+
+    def update(self, price: str, volume: str) -> None:
+        key = float(price)
+        if float(volume) == 0:
+            if key in self.levels:
+                del self.levels[key]
+                del self.prices[bisect.bisect_left(self.prices, key)]
+
+            return
+
+        if key not in self.levels:
+            bisect.insort(self.prices, key)
+
+        self.levels[key] = (price, volume)
+
+    def truncate(self, depth: int) -> None:
+        """Drop the levels beyond the subscribed depth."""
+        extra = len(self.prices) - depth
+        if extra <= 0:
+            return
+
+        dropped = (
+            self.prices[:extra] if self.descending else self.prices[-extra:]
+        )
+        for key in dropped:
+            del self.levels[key]
+
+        if self.descending:
+            del self.prices[:extra]
+        else:
+            del self.prices[-extra:]
+
+    def best(self, count: int | None = None) -> list[tuple[str, str]]:
+        """Levels from the best price outwards."""
+        prices = reversed(self.prices) if self.descending else self.prices
+        levels = [self.levels[key] for key in prices]
+        return levels if count is None else levels[:count]
+
+
+@typechecked
+class OrderBook:
+    """In-memory order book of a pair maintained from WebSocket updates.
+
+    Levels keep the price and volume strings sent by Kraken so that the
+    CRC32 checksum of the top ten levels can be verified after each update.
+
+    references:
+        * https://docs.kraken.com/websockets/#book-checksum
+    """
+
+    def __init__(self, pair: str, depth: int = 10) -> None:
+        self.pair = pair
+        self.depth = depth
+        self.asks = _BookSide(descending=False)
+        self.bids = _BookSide(descending=True)
+
+    def apply_snapshot(self, asks: list[Level], bids: list[Level]) -> None:
+        """Replace the book with a snapshot."""
+        self.asks.clear()
+        self.bids.clear()
+        self.apply_update(asks, bids)
+
+    def apply_update(self, asks: list[Level], bids: list[Level]) -> None:
+        """Apply incremental updates, in the order they were sent."""
+        for price, volume, *_ in asks:
+            self.asks.update(price, volume)
+
+        for price, volume, *_ in bids:
+            self.bids.update(price, volume)
+
+        self.asks.truncate(self.depth)
+        self.bids.truncate(self.depth)
+
+    def checksum(self) -> int:
+        """CRC32 checksum of the top ten levels of each side."""
+        message = "".join(
+            _checksum_part(price) + _checksum_part(volume)
+            for side in (self.asks, self.bids)
+            for price, volume in side.best(10)
+        )
+        return zlib.crc32(message.encode())
+
+    def validate(self, checksum: str) -> None:
+        """Raise when the book does not match the checksum sent by Kraken."""
+        if self.checksum() != int(checksum):
+            raise KrakenChecksumError(
+                f"{self.pair}: book checksum {self.checksum()} does not "
+                f"match {checksum}."
+            )
+
+
+@typechecked
+@dataclass
+class BookUpdate:
+    """The book of a pair after a snapshot or an update."""
+
+    pair: str
+    book: OrderBook
+
+
+@typechecked
+@dataclass
+class TradeUpdate:
+    """Trades of a pair: price, volume, time, side, order type and misc."""
+
+    pair: str
+    trades: list[list[str]]
+
+
+@typechecked
+@dataclass
+class OHLCUpdate:
+    """Candle of a pair being built.
+
+    Fields are time, etime, open, high, low, close, vwap, volume and count.
+    """
+
+    pair: str
+    interval: int
+    candle: list[str | int]
+
+
+Update = BookUpdate | TradeUpdate | OHLCUpdate
+
+
+@typechecked
+class KrakenWebSocket:
+    """Kraken WebSocket market data client.
+
+    Subscribe to ``book``, ``trade`` or ``ohlc`` channels, then iterate over
+    the client to receive updates. Books are kept up to date in ``books``.
+    A book whose checksum does not match is dropped and resubscribed
+    before more updates are yielded for its pair.
+    """
+
+    def __init__(self, url: str = WS_URL, *, depth: int = 10) -> None:
+        self.url = url
+        self.depth = depth
+        self.books: dict[str, OrderBook] = {}
+        self.checksum_errors = 0
+        self._connection: Any = None
+        self._resyncing: set[str] = set()
+
+    async def __aenter__(self) -> "KrakenWebSocket":
+        try:
+            import websockets  # pylint: disable=import-outside-toplevel
+        except ImportError as error:  # pragma: no cover
+            raise ImportError(
+                "KrakenWebSocket requires websockets: "
+                "pip install okapi[websocket]"
+            ) from error
+
+        self._connection = await websockets.connect(self.url)
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self._connection.close()
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        await self._connection.send(json.dumps(message))
+
+    async def subscribe(
+        self, name: str, pairs: list[str], **options: Any
+    ) -> None:
+        """Subscribe to a channel for the given pairs."""
+        if name == "book":
+            options.setdefault("depth", self.depth)
+
+        await self._send(
+            {
+                "event": "subscribe",
+                "pair": pairs,
+                "subscription": {"name": name, **options},
+            }
+        )
+
+    async def unsubscribe(
+        self, name: str, pairs: list[str], **options: Any
+    ) -> None:
+        """Unsubscribe from a channel for the given pairs."""
+        await self._send(
+            {
+                "event": "unsubscribe",
+                "pair": pairs,
+                "subscription": {"name": name, **options},
+            }
+        )
+
+    def _book(self, pair: str, payload: dict[str, Any]) -> BookUpdate | None:
+        if "as" in payload or "bs" in payload:
+            book = OrderBook(pair, self.depth)
+            book.apply_snapshot(payload.get("as", []), payload.get("bs", []))
+            self.books[pair] = book
+            self._resyncing.discard(pair)
+            return BookUpdate(pair, book)
+
+        if pair in self._resyncing or pair not in self.books:
+            return None
+
+        book = self.books[pair]
+        book.apply_update(payload.get("a", []), payload.get("b", []))
+        if "c" in payload:
+            book.validate(payload["c"])
+
+        return BookUpdate(pair, book)
+
+    def handle(self, message: Any) -> list[Update]:
+        """Turn a decoded WebSocket message into updates."""
+        if isinstance(message, dict):
+            if message.get("status") == "error":
+                raise KrakenAPIError([message.get("errorMessage", "")])
+
+            return []
+
+        channel, pair = message[-2], message[-1]
+        payloads = message[1:-2]
+        if channel.startswith("book"):
+            merged: dict[str, Any] = {}
+            for payload in payloads:
+                merged.update(payload)
+
+            update = self._book(pair, merged)
+            return [] if update is None else [update]
+
+        if channel == "trade":
+            return [TradeUpdate(pair, payloads[0])]
+
+        if channel.startswith("ohlc"):
+            interval = int(channel.split("-")[1])
+            return [OHLCUpdate(pair, interval, payloads[0])]
+
+        return []
+
+    async def _resync(self, pair: str) -> None:
+        self.checksum_errors += 1
+        self._resyncing.add(pair)
+        self.books.pop(pair, None)
+        await self.unsubscribe("book", [pair], depth=self.depth)
+        await self.subscribe("book", [pair], depth=self.depth)
+
+    async def __aiter__(self) -> AsyncIterator[Update]:
+        async for frame in self._connection:
+            message = json.loads(frame)
+            try:
+                updates = self.handle(message)
+            except KrakenChecksumError:
+                await self._resync(message[-1])
+                continue
+
+            for update in updates:
+                yield update
@@ -0,0 +1,142 @@
+"""Test configuration for the okapi package."""
+import os
+from typing import Callable
+
+import httpx
+import pytest
+
+
+os.environ.setdefault("OKAPI_TYPECHECK", "1")
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+SECRET = (
+    "kQH5HW/8p1uGOVjbgWA7FunAmGO8lsSUXNsu3eow76sz84Q18fWxnyRzBHCd3pd5nE9qa99HAZt"
+    "uZuj6F1huXg=="
+)
+
+
+OHLC = {
+    "XXBTZUSD": [
+        [
+            1650000060,
+            "40010.0",
+            "40020.0",
+            "40000.0",
+            "40015.0",
+            "40012.5",
+            "1.5",
+            12,
+        ],
+        [
+            1650000000,
+            "40000.0",
+            "40010.0",
+            "39990.0",
+            "40010.0",
+            "40005.0",
+            "2.0",
+            20,
+        ],
+    ],
+    "last": 1650000000,
+}
+
+
+TICKER = {
+    "XXBTZUSD": {
+        "a": ["40010.00000", "1", "1.000"],
+        "b": ["40000.00000", "2", "2.000"],
+        "c": ["40005.00000", "0.01000000"],
+        "v": ["100.5", "2000.25"],
+        "p": ["40001.0", "39950.5"],
+        "t": [1200, 25000],
+        "l": ["39000.00000", "38500.00000"],
+        "h": ["41000.00000", "41500.00000"],
+        "o": "39500.00000",
+    }
+}
+ASSET_PAIRS = {
+    "XXBTZUSD": {
+        "altname": "XBTUSD",
+        "pair_decimals": 1,
+        "lot_decimals": 8,
+        "lot_multiplier": 1,
+        "margin_call": 80,
+        "margin_stop": 40,
+        "ordermin": "0.0001",
+        "fees": [[0, 0.26], [50000, 0.24]],
+        "fees_maker": [[0, 0.16]],
+        "leverage_buy": [2, 3, 4, 5],
+        "leverage_sell": [],
+    }
+}
+ASSETS = {
+    "XXBT": {
+        "aclass": "currency",
+        "altname": "XBT",
+        "decimals": 10,
+        "display_decimals": 5,
+    }
+}
+
+
+DEPTH = {
+    "XXBTZUSD": {
+        "asks": [
+            ["40010.00000", "1.500", 1650000001],
+            ["40020.00000", "2.000", 1650000002],
+        ],
+        "bids": [
+            ["40000.00000", "0.500", 1650000003],
+            ["39990.00000", "3.000", 1650000004],
+        ],
+    }
+}
+SPREAD = {
+    "XXBTZUSD": [
+        [1650000000, "40000.00000", "40010.00000"],
+        [1650000001, "40001.00000", "40009.00000"],
+    ],
+    "last": 1650000001,
+}
+
+
+def _kraken_handler(request: httpx.Request) -> httpx.Response:
+    """Answer Kraken public endpoints with canned payloads."""
+    results = {
+        "/0/public/Time": {
+            "unixtime": 1650000000,
+            "rfc1123": "Fri, 15 Apr 22 05:20:00 +0000",
+        },
+        "/0/public/SystemStatus": {
+            "status": "online",
+            "timestamp": "2022-04-15T05:20:00Z",
+        },
+        "/0/public/OHLC": OHLC,
+        "/0/public/Ticker": TICKER,
+        "/0/public/Assets": ASSETS,
+        "/0/public/AssetPairs": ASSET_PAIRS,
+        "/0/public/Depth": DEPTH,
+        "/0/public/Spread": SPREAD,
+    }
+    result = results[request.url.path]
+    return httpx.Response(200, json={"error": [], "result": result})
+
+
+@pytest.fixture(name="secret")
+def api_secret() -> str:
+    """Fixture for the API secret of the Kraken documentation examples."""
+    return SECRET
+
+
+@pytest.fixture(name="kraken_handler")
+def canned_kraken_handler() -> Handler:
+    """Fixture answering Kraken public endpoints with canned payloads."""
+    return _kraken_handler
+
+
+@pytest.fixture(name="transport")
+def mock_transport(kraken_handler: Handler) -> httpx.MockTransport:
+    """Fixture for a local Kraken stand-in."""
+    return httpx.MockTransport(kraken_handler)
@@ -0,0 +1,237 @@
+"""Test cases for the api package."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from .conftest import Handler
+from okapi.api.kraken import AsyncKrakenRESTAPI
+from okapi.api.kraken import KrakenRESTAPI
+from okapi.api.market import CompactOHLC
+from okapi.api.market import OHLCBatch
+from okapi.api.metadata import MetadataCache
+from okapi.client import AsyncClient
+from okapi.client import Client
+from okapi.exception import KrakenAPIError
+
+
+def test_sync_ohlc_data(transport: httpx.MockTransport) -> None:
+    """It parses OHLC pages into sorted frames."""
+    with Client(transport=transport) as client:
+        response = KrakenRESTAPI(client).market.ohlc_data("XBTUSD")
+
+    assert response["last"] == 1650000000
+    ohlc = response["XXBTZUSD"]
+    assert list(ohlc.time) == [1650000000, 1650000060]
+
+
+def test_compact_ohlc_data(transport: httpx.MockTransport) -> None:
+    """It builds compact frames indexed by time with the given dtypes."""
+    with Client(transport=transport) as client:
+        market = KrakenRESTAPI(client).market
+        ohlc = market.ohlc_data("XBTUSD", compact=CompactOHLC())["XXBTZUSD"]
+        scaled = market.ohlc_data(
+            "XBTUSD", compact=CompactOHLC(price="int32", decimals=1)
+        )["XXBTZUSD"]
+        default = market.ohlc_data("XBTUSD")["XXBTZUSD"]
+
+    assert list(ohlc.index) == [1650000000, 1650000060]
+    assert ohlc.index.name == "time"
+    assert ohlc.dtypes.astype(str).tolist() == ["float32"] * 6 + ["int32"]
+    assert list(scaled.vwap) == [400050, 400125]
+    assert scaled.open.dtype == "int32"
+    assert ohlc.memory_usage().sum() <= default.memory_usage().sum() / 2
+    columns = {
+        name: column.to_numpy() for name, column in ohlc.reset_index().items()
+    }
+    with pytest.raises(OverflowError):
+        CompactOHLC(price="int16", decimals=1).frame(columns)
+
+    with pytest.raises(ValueError):
+        CompactOHLC(price="int64")
+
+
+def test_async_matches_sync(transport: httpx.MockTransport) -> None:
+    """It returns the same parsed results as the sync API."""
+
+    async def fetch() -> tuple[dict, dict]:
+        async with AsyncClient(transport=transport) as client:
+            market = AsyncKrakenRESTAPI(client).market
+            return await asyncio.gather(
+                market.server_time(), market.ohlc_data("XBTUSD")
+            )
+
+    server_time, ohlc = asyncio.run(fetch())
+    with Client(transport=transport) as client:
+        market = KrakenRESTAPI(client).market
+        assert server_time == market.server_time()
+        assert ohlc["XXBTZUSD"].equals(market.ohlc_data()["XXBTZUSD"])
+
+
+def test_raw_response(transport: httpx.MockTransport) -> None:
+    """It returns the raw response when asked."""
+    with Client(transport=transport) as client:
+        response = KrakenRESTAPI(client).market.server_time(raw=True)
+
+    assert json.loads(response.content)["result"]["unixtime"] == 1650000000
+
+
+def test_ticker_information(transport: httpx.MockTransport) -> None:
+    """It parses tickers to arrays or to flat typed columns."""
+    with Client(transport=transport) as client:
+        market = KrakenRESTAPI(client).market
+        ticker = market.ticker_information("XBTUSD")
+        flat = market.ticker_information("XBTUSD", columnar=True)
+
+    assert list(ticker.loc["XXBTZUSD", "l"]) == [39000.0, 38500.0]
+    assert list(ticker.loc["XXBTZUSD", "h"]) == [41000.0, 41500.0]
+    assert flat.loc["XXBTZUSD", "vwap_24h"] == 39950.5
+    assert flat.trades_today.dtype == "int64"
+    assert flat.opening_price.dtype == "float64"
+
+
+def test_tradable_asset_pairs(transport: httpx.MockTransport) -> None:
+    """It parses fee schedules to float arrays."""
+    with Client(transport=transport) as client:
+        pairs = KrakenRESTAPI(client).market.tradable_asset_pairs("XBTUSD")
+
+    assert pairs.loc["XXBTZUSD", "fees"].shape == (2, 2)
+    assert pairs.loc["XXBTZUSD", "fees_maker"][0, 1] == 0.16
+    assert len(pairs.loc["XXBTZUSD", "leverage_sell"]) == 0
+    assert pairs.pair_decimals.dtype == "int64"
+
+
+def test_ohlc_data_many_reports_failures(kraken_handler: Handler) -> None:
+    """It returns the pairs that succeeded and the errors of the others."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["pair"] == "BADPAIR":
+            return httpx.Response(
+                200, json={"error": ["EQuery:Unknown asset pair"]}
+            )
+
+        return kraken_handler(request)
+
+    transport = httpx.MockTransport(handler)
+    pairs = ["XBTUSD", "BADPAIR", "ETHUSD"]
+    with Client(transport=transport) as client:
+        batch = KrakenRESTAPI(client).market.ohlc_data_many(pairs)
+
+    async def fetch() -> OHLCBatch:
+        async with AsyncClient(transport=transport) as client:
+            market = AsyncKrakenRESTAPI(client).market
+            return await market.ohlc_data_many(pairs, concurrency=2)
+
+    for result in (batch, asyncio.run(fetch())):
+        assert set(result.frames) == {"XBTUSD", "ETHUSD"}
+        assert isinstance(result.errors["BADPAIR"], KrakenAPIError)
+        assert result.last["ETHUSD"] == 1650000000
+        assert result.to_frame().index.names == ["pair", "dtime"]
+
+
+def test_ohlc_data_many_cancelled(kraken_handler: Handler) -> None:
+    """It raises when the request of a pair is cancelled."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["pair"] == "ETHUSD":
+            raise asyncio.CancelledError
+
+        return kraken_handler(request)
+
+    async def fetch() -> OHLCBatch:
+        async with AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            market = AsyncKrakenRESTAPI(client).market
+            return await market.ohlc_data_many(["XBTUSD", "ETHUSD"])
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(fetch())
+
+
+def test_order_book(transport: httpx.MockTransport) -> None:
+    """It returns structured arrays with vectorized helpers."""
+    with Client(transport=transport) as client:
+        market = KrakenRESTAPI(client).market
+        book = market.order_book("XBTUSD", count=2)["XXBTZUSD"]
+        spreads = market.recent_spreads("XBTUSD")
+
+    assert book.asks.dtype.names == ("price", "volume", "timestamp")
+    assert book.bids["timestamp"][0] == 1650000003
+    assert book.mid_price() == 40005.0
+    assert book.spread() == 10.0
+    asks, bids = book.cumulative_depth(2)
+    assert list(asks) == [1.5, 3.5]
+    assert list(bids) == [0.5, 3.5]
+    assert spreads["last"] == 1650000001
+    assert spreads["XXBTZUSD"]["ask"][1] == 40009.0
+
+
+def test_metadata_cache(tmp_path, kraken_handler: Handler) -> None:
+    """It serves metadata from memory, then from disk, until invalidated."""
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return kraken_handler(request)
+
+    snapshot = tmp_path / "metadata.json"
+    with Client(transport=httpx.MockTransport(handler)) as client:
+        market = KrakenRESTAPI(client).market
+        cache = MetadataCache(market, path=snapshot)
+        assert cache.pair_info("XBTUSD")["lot_decimals"] == 8
+        assert cache.asset_info()["XXBT"]["decimals"] == 10
+        assert cache.tradable_asset_pairs() is cache.tradable_asset_pairs()
+        assert len(paths) == 2
+
+        warm = MetadataCache(market, path=snapshot)
+        assert warm.pair_info("XXBTZUSD")["ordermin"] == 0.0001
+        assert len(paths) == 2
+
+        warm.invalidate("asset_pairs")
+        warm.tradable_asset_pairs()
+        assert paths[-1] == "/0/public/AssetPairs"
+        assert len(paths) == 3
+
+
+def test_coalesced_calls(kraken_handler: Handler) -> None:
+    """It shares one request among identical concurrent calls."""
+    paths = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return kraken_handler(request)
+
+    async def fetch() -> list:
+        async with AsyncClient(
+            transport=httpx.MockTransport(handler), coalesce=True
+        ) as client:
+            market = AsyncKrakenRESTAPI(client).market
+            return await asyncio.gather(
+                *(market.ticker_information("XBTUSD") for _ in range(4)),
+                market.ticker_information("XBTUSD", columnar=True),
+                market.ohlc_data("XBTUSD"),
+            )
+
+    *tickers, columnar, ohlc = asyncio.run(fetch())
+    assert all(ticker is tickers[0] for ticker in tickers)
+    assert "ask_price" in columnar
+    assert ohlc["last"] == 1650000000
+    assert sorted(paths) == ["/0/public/OHLC"] + 2 * ["/0/public/Ticker"]
+
+
+def test_coalesced_results_are_copies(transport: httpx.MockTransport) -> None:
+    """It gives every coalesced caller a result of its own to mutate."""
+
+    async def fetch() -> list[int]:
+        async with AsyncClient(transport=transport, coalesce=True) as client:
+            market = AsyncKrakenRESTAPI(client).market
+
+            async def pop() -> int:
+                return (await market.ohlc_data("XBTUSD")).pop("last")
+
+            return await asyncio.gather(pop(), pop())
+
+    assert asyncio.run(fetch()) == [1650000000, 1650000000]
@@ -0,0 +1,33 @@
+"""Test cases for the auth module."""
+import httpx
+import pytest
+
+from okapi.auth import KrakenAuth
+
+
+SIGNATURE = (
+    "4/dpxb3iT4tp/ZCVEwSnEsLxx0bqyhLpdfOpc6fn7OR8+UClSV5n9E6aSS8MPtnRfp32bAb0nmbR"
+    "n6H8ndwLUQ=="
+)
+DATA = {
+    "nonce": "1616492376594",
+    "ordertype": "limit",
+    "pair": "XBTUSD",
+    "price": "37500",
+    "type": "buy",
+    "volume": "1.25",
+}
+
+
+@pytest.mark.parametrize("extensions", [{}, {"nonce": DATA["nonce"]}])
+def test_sign_request(extensions: dict[str, str], secret: str) -> None:
+    """It matches the signature from the Kraken documentation."""
+    auth = KrakenAuth(key="key", secret=secret)
+    request = httpx.Request(
+        "POST",
+        "https://api.kraken.com/0/private/AddOrder",
+        data=DATA,
+        extensions=extensions,
+    )
+    assert auth.sign_request(request) == SIGNATURE
+    assert auth.sign_request(request) == SIGNATURE
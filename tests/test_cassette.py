@@ -0,0 +1,86 @@
+"""Test cases for the cassette module."""
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from .conftest import Handler
+from okapi.api.kraken import AsyncKrakenRESTAPI
+from okapi.api.kraken import KrakenRESTAPI
+from okapi.api.utils import content
+from okapi.cassette import CassetteError
+from okapi.cassette import load_cassette
+from okapi.cassette import RecordingTransport
+from okapi.cassette import ReplayTransport
+from okapi.client import AsyncClient
+from okapi.client import Client
+
+
+@pytest.fixture(name="cassette")
+def recorded_cassette(tmp_path: Path, kraken_handler: Handler) -> Path:
+    """Fixture for a cassette recorded against the local stand-in."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        """Answer private calls too, with a fresh result every time."""
+        if request.url.path.startswith("/0/private/"):
+            return httpx.Response(
+                200, json={"error": [], "result": {"ZUSD": str(time.time())}}
+            )
+
+        return kraken_handler(request)
+
+    path = tmp_path / "kraken.jsonl.gz"
+    transport = RecordingTransport(
+        path, transport=httpx.MockTransport(handler)
+    )
+    with Client(key="key", secret="c2VjcmV0", transport=transport) as client:
+        kapi = KrakenRESTAPI(client)
+        kapi.market.ohlc_data("XBTUSD")
+        kapi.user.trade_balance()
+        kapi.user.trade_balance()
+
+    return path
+
+
+def test_replay(cassette: Path) -> None:
+    """It serves recorded responses, whatever the nonce, in turn."""
+    records = load_cassette(cassette)
+    assert [record["path"] for record in records] == [
+        "/0/public/OHLC",
+        "/0/private/TradeBalance",
+        "/0/private/TradeBalance",
+    ]
+    assert "key" not in str(records)
+
+    with Client(transport=ReplayTransport(cassette)) as client:
+        kapi = KrakenRESTAPI(client)
+        assert kapi.market.ohlc_data("XBTUSD")["last"] == 1650000000
+        balances = [content(kapi.user.trade_balance()) for _ in range(3)]
+        with pytest.raises(CassetteError):
+            kapi.market.ohlc_data("ETHUSD")
+
+    assert balances[0] != balances[1] == balances[2]
+
+
+def test_replay_latency_and_concurrency(cassette: Path) -> None:
+    """It serves at most ``concurrency`` requests every ``latency``.
+
+    The transport can be reused across event loops.
+    """
+    transport = ReplayTransport(cassette, latency=0.05, concurrency=2)
+
+    async def fetch() -> None:
+        async with AsyncClient(transport=transport) as client:
+            market = AsyncKrakenRESTAPI(client).market
+            await asyncio.gather(
+                *(market.ohlc_data("XBTUSD") for _ in range(4))
+            )
+
+    for _ in range(2):
+        start = time.monotonic()
+        asyncio.run(fetch())
+        assert 0.1 <= time.monotonic() - start < 0.2
+
+    assert transport.served == 8
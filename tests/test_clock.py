@@ -0,0 +1,85 @@
+"""Test cases for the clock module."""
+import asyncio
+import json
+import math
+import time
+
+import httpx
+import pytest
+
+from okapi.client import AsyncClient
+from okapi.client import Client
+from okapi.clock import ClockSync
+from okapi.clock import IntervalScheduler
+
+
+OFFSET = 42.3
+
+
+def time_handler(request: httpx.Request) -> httpx.Response:
+    """Kraken Time endpoint of a server ahead by ``OFFSET`` seconds."""
+    unixtime = int(time.time() + OFFSET)
+    return httpx.Response(
+        200,
+        content=json.dumps(
+            {"error": [], "result": {"unixtime": unixtime, "rfc1123": ""}}
+        ).encode(),
+    )
+
+
+def test_add_sample() -> None:
+    """It intersects the offset bounds of the samples."""
+    clock = ClockSync(samples=3)
+    clock.add_sample(100.0, 110, 100.2)
+    assert clock.offset == pytest.approx(10.4)
+    assert clock.error == pytest.approx(0.6)
+    assert clock.rtt == pytest.approx(0.2)
+
+    clock.add_sample(100.5, 111, 100.6)
+    assert (clock.offset, clock.error) == pytest.approx((10.7, 0.3))
+
+    clock.add_sample(200.0, 150, 200.1)
+    assert (clock.offset, clock.error) == pytest.approx((-49.55, 0.55))
+    assert len(clock.bounds) == 1
+
+
+def test_calibrate() -> None:
+    """It estimates the offset of the server clock."""
+    clock = ClockSync(samples=4)
+    with Client(transport=httpx.MockTransport(time_handler)) as client:
+        clock.calibrate(client)
+
+    assert abs(clock.offset - OFFSET) <= clock.error + 0.01
+    assert clock.error <= 0.5
+    assert abs(clock.now() - time.time() - OFFSET) < 1
+
+    clock = ClockSync(samples=4)
+
+    async def calibrate() -> None:
+        transport = httpx.MockTransport(time_handler)
+        async with AsyncClient(transport=transport) as client:
+            await clock.calibrate_async(client)
+
+    asyncio.run(calibrate())
+    assert abs(clock.offset - OFFSET) <= clock.error + 0.01
+
+
+def test_interval_scheduler() -> None:
+    """It wakes up once per boundary of the server clock."""
+    clock = ClockSync()
+    local = time.time()
+    clock.offset = math.ceil(local / 60) * 60 + 60 - 0.05 - local
+    clock.error = 0.01
+    scheduler = IntervalScheduler(clock, 1, delay=0.02)
+
+    start = time.perf_counter()
+    close = scheduler.wait()
+    assert 0.07 <= time.perf_counter() - start < 0.5
+    assert close % 60 == 0
+    assert clock.now() >= close
+
+    clock.offset -= 1
+    assert scheduler.next_close() == close + 60
+
+    clock.offset = close + 60 - 0.05 - time.time()
+    assert asyncio.run(scheduler.wait_async()) == close + 60
@@ -0,0 +1,67 @@
+"""Test cases for the coalesce module."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from okapi.coalesce import SingleFlight
+
+
+def test_single_flight_shares_result() -> None:
+    """It runs one call for concurrent callers of the same key."""
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def call() -> object:
+        calls.append(None)
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(4) as executor:
+        leader = executor.submit(flights.do, "key", call)
+        while not calls:
+            time.sleep(0.001)
+
+        followers = [
+            executor.submit(flights.do, "key", call) for _ in range(3)
+        ]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in [leader, *followers]]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert len(flights) == 0
+
+
+def test_single_flight_shares_errors() -> None:
+    """It raises the error of the call and forgets the key."""
+    flights = SingleFlight()
+
+    def fail() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        flights.do("key", fail)
+
+    assert flights.do("key", lambda: 1) == 1
+
+
+def test_single_flight_copies_dicts() -> None:
+    """It gives every follower its own copy of a dict result."""
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def call() -> dict[str, int]:
+        release.wait(5)
+        return {"last": 1}
+
+    with ThreadPoolExecutor(3) as executor:
+        futures = [executor.submit(flights.do, "key", call) for _ in range(3)]
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert [result.pop("last") for result in results] == [1, 1, 1]
@@ -0,0 +1,123 @@
+"""Test cases for the collector module."""
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from okapi.api.market import AsyncMarketRESTAPI
+from okapi.client import AsyncClient
+from okapi.clock import ClockSync
+from okapi.collector import Collector
+from okapi.collector import shard
+from okapi.store import CandleStore
+
+
+def ohlc_handler(request: httpx.Request) -> httpx.Response:
+    """Two candles per pair, then nothing after the cursor."""
+    if request.url.params["pair"] == "BAD":
+        result = {"error": ["EQuery:Unknown asset pair"]}
+        return httpx.Response(200, json=result)
+
+    since = int(request.url.params.get("since", 0))
+    rows = [
+        [time, "1.0", "2.0", "0.5", "1.5", "1.2", "3.0", 4]
+        for time in (1650000000, 1650000060)
+        if time >= since
+    ]
+    result = {request.url.params["pair"]: rows, "last": 1650000000}
+    return httpx.Response(200, json={"error": [], "result": result})
+
+
+def test_shard() -> None:
+    """It splits the pairs evenly."""
+    assert shard(["A", "B", "C"], 2) == [["A", "C"], ["B"]]
+
+
+def test_collector(tmp_path: Path) -> None:
+    """It appends the new candles of every pair and serves its health."""
+    clock = ClockSync()
+    clock.offset = 1650000121.0 - clock.clock()
+    store = CandleStore(tmp_path)
+
+    async def collect() -> tuple[dict[str, Any], bytes]:
+        transport = httpx.MockTransport(ohlc_handler)
+        async with AsyncClient(transport=transport) as client:
+            collector = Collector(
+                AsyncMarketRESTAPI(client),
+                store,
+                ["XBTUSD", "ETHUSD", "BAD"],
+                clock=clock,
+            )
+            await collector.cycle(1, 1650000120)
+            await collector.cycle(1, 1650000120)
+            server = await collector.serve()
+            port = server.sockets[0].getsockname()[1]
+            async with server, httpx.AsyncClient() as http:
+                health = await http.get(f"http://127.0.0.1:{port}/health")
+                metrics = await http.get(f"http://127.0.0.1:{port}/metrics")
+
+        assert health.status_code == 200
+        return health.json(), metrics.content
+
+    health, metrics = asyncio.run(collect())
+    assert len(store.read("XBTUSD", 1)) == 2
+    assert len(store.read("ETHUSD", 1)) == 2
+    assert health["healthy"]
+    assert health["errors"] == 2
+    assert health["intervals"]["1"]["close"] == 1650000120
+    assert b'okapi_collector_candles_total{interval="1"} 4.0' in metrics
+    assert b'okapi_collector_errors_total{interval="1"} 2.0' in metrics
+
+
+def test_collector_intervals(tmp_path: Path) -> None:
+    """It keeps intervals given as a generator and is unhealthy at first."""
+
+    async def create() -> Collector:
+        async with AsyncClient() as client:
+            return Collector(
+                AsyncMarketRESTAPI(client),
+                CandleStore(tmp_path),
+                ["XBTUSD"],
+                (interval for interval in [1, 5]),
+            )
+
+    collector = asyncio.run(create())
+    assert collector.intervals == (1, 5)
+    assert not collector.health()["healthy"]
+
+
+def test_collector_survives_errors(tmp_path: Path) -> None:
+    """It counts unexpected errors of a pair and keeps collecting."""
+
+    class FullStore(CandleStore):
+        def append(self, pair: Any, *args: Any) -> int:
+            if pair == "ETHUSD":
+                raise OSError("No space left on device")
+
+            return super().append(pair, *args)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params["pair"] == "EMPTY":
+            result = {"error": [], "result": {"last": 1650000000}}
+            return httpx.Response(200, json=result)
+
+        return ohlc_handler(request)
+
+    store = FullStore(tmp_path)
+
+    async def collect() -> Collector:
+        transport = httpx.MockTransport(handler)
+        async with AsyncClient(transport=transport) as client:
+            collector = Collector(
+                AsyncMarketRESTAPI(client),
+                store,
+                ["XBTUSD", "ETHUSD", "EMPTY"],
+            )
+            await collector.cycle(1, 1650000120)
+            return collector
+
+    collector = asyncio.run(collect())
+    assert collector.errors == 2
+    assert collector.closes == {1: 1650000120}
+    assert len(store.read("XBTUSD", 1)) == 2
@@ -0,0 +1,50 @@
+"""Test cases for the decode module."""
+import httpx
+import numpy as np
+import pytest
+
+from okapi.api.decode import numeric_tables
+from okapi.api.market import _decode_ohlc
+from okapi.api.market import _ohlc_columns
+from okapi.api.utils import loads
+
+
+def test_numeric_tables() -> None:
+    """It decodes rows of numbers and numeric strings per pair."""
+    body = (
+        b'{"error":[],"result":{"XXBTZUSD":[[1,"2.5","3"],[4,"5","6.25"]],'
+        b'"XETHZUSD":[],"last":4}}'
+    )
+    tables, last = numeric_tables(httpx.Response(200, content=body), 3)
+    assert last == 4
+    assert tables["XXBTZUSD"].tolist() == [[1, 2.5, 3], [4, 5, 6.25]]
+    assert tables["XETHZUSD"].shape == (0, 3)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"error":["EGeneral:Invalid arguments"]}',
+        b'{"error":[],"result":{"XXBTZUSD":[[1,"2","3"],[4]],"last":4}}',
+        b'{"error":[],"result":{"XXBTZUSD":[[1,"2","3"]]}}',
+        b'{"error":[],"result":{"XXBTZUSD":[[1,"2","3"]],"last":4},"x":1}',
+    ],
+)
+def test_numeric_tables_fallback(body: bytes) -> None:
+    """It leaves responses of another shape to the generic decoder."""
+    assert numeric_tables(httpx.Response(200, content=body), 3) is None
+
+
+def test_decode_ohlc_matches_generic_path() -> None:
+    """It gives the same typed columns as decoding the rows."""
+    rows = [[1650000000, "1.5", "2", "1", "1.75", "1.6", "0.1", 3]]
+    response = httpx.Response(
+        200, json={"error": [], "result": {"XXBTZUSD": rows, "last": 1}}
+    )
+    pairs, last = _decode_ohlc(response)
+    columns = pairs["XXBTZUSD"]
+    expected = _ohlc_columns(loads(response.content)["result"]["XXBTZUSD"])
+    assert last == 1
+    for name, column in expected.items():
+        assert columns[name].dtype == column.dtype
+        np.testing.assert_array_equal(columns[name], column)
@@ -0,0 +1,133 @@
+"""Test cases for the history and store modules."""
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pytest
+
+from okapi.api.history import OHLCBackfill
+from okapi.api.history import TradeStream
+from okapi.api.market import _ohlc_columns
+from okapi.api.market import MarketRESTAPI
+from okapi.client import Client
+from okapi.store import CandleStore
+
+
+START = 1650000000
+STOP = START + 60 * 2000
+
+
+def candle(time: int) -> list[int | str]:
+    """Build a Kraken OHLC row."""
+    price = str(40000.0 + (time - START) / 60)
+    return [time, price, price, price, price, price, "1.0", 1]
+
+
+def paginated_ohlc(request: httpx.Request) -> httpx.Response:
+    """Serve pages of 720 candles ending with the in-progress candle."""
+    since = int(request.url.params.get("since", START))
+    times = range(since, min(since + 720 * 60, STOP + 60), 60)
+    rows = [candle(time) for time in times]
+    last = rows[-2][0] if len(rows) > 1 else since
+    return httpx.Response(
+        200, json={"error": [], "result": {"XXBTZUSD": rows, "last": last}}
+    )
+
+
+def paginated_trades(request: httpx.Request) -> httpx.Response:
+    """Serve 2500 trades, 1000 per page, with nanosecond cursors."""
+    since = int(request.url.params.get("since", 0))
+    first = since // 10**9 - START if since else 0
+    rows = [
+        [str(40000.0 + i), "0.1", START + i + 0.5, "bs"[i % 2], "l", "", i]
+        for i in range(first, min(first + 1000, 2500))
+    ]
+    last = (START + first + len(rows)) * 10**9 if rows else since
+    return httpx.Response(
+        200, json={"error": [], "result": {"XXBTZUSD": rows, "last": last}}
+    )
+
+
+@pytest.fixture(name="market")
+def mock_market() -> MarketRESTAPI:
+    """Fixture for a market API served by a local transport."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("Trades"):
+            return paginated_trades(request)
+
+        return paginated_ohlc(request)
+
+    transport = httpx.MockTransport(handler)
+    return MarketRESTAPI(Client(transport=transport))
+
+
+def test_backfill_follows_cursor(market: MarketRESTAPI) -> None:
+    """It follows ``last`` and keeps each candle once."""
+    ohlc = OHLCBackfill(market, "XBTUSD", since=START).run()
+    assert len(ohlc) == 2001
+    assert ohlc.time.is_monotonic_increasing
+    assert ohlc.time.is_unique
+
+
+def test_backfill_resumes(market: MarketRESTAPI, tmp_path: Path) -> None:
+    """It resumes from its checkpoint."""
+    backfill = OHLCBackfill(market, "XBTUSD", since=START, checkpoint=tmp_path)
+    next(backfill.pages())
+
+    resumed = OHLCBackfill(market, "XBTUSD", checkpoint=tmp_path)
+    assert resumed.since == START + 718 * 60
+    assert len(resumed.buffer) == 720
+    assert len(resumed.run()) == 2001
+
+
+def test_store_syncs_incrementally(
+    market: MarketRESTAPI, tmp_path: Path
+) -> None:
+    """It only fetches candles after the stored cursor."""
+    store = CandleStore(tmp_path)
+    store.append("XBTUSD", 1, _ohlc_columns([candle(START)]), START)
+    ohlc = store.sync(market, "XBTUSD")
+    assert len(ohlc) == 2001
+    assert ohlc.time.is_unique
+    assert store.last("XBTUSD", 1) == STOP - 60
+    assert isinstance(store.columns("XBTUSD", 1)["close"], np.memmap)
+    buckets = np.unique(ohlc.time // 7200)
+    assert list(store.resample("XBTUSD", 120).time) == list(buckets * 7200)
+
+
+def test_trade_stream_chunks(market: MarketRESTAPI) -> None:
+    """It streams every trade once in fixed-size chunks."""
+    stream = TradeStream(market, "XBTUSD", chunk_size=600)
+    sizes, trade_ids = [], []
+    for chunk in stream:
+        sizes.append(len(chunk["trade_id"]))
+        trade_ids.extend(chunk["trade_id"])
+
+    assert sizes == [600, 600, 600, 600, 100]
+    assert trade_ids == list(range(2500))
+    assert stream.since == (START + 2500) * 10**9
+
+
+def test_recent_trades(market: MarketRESTAPI) -> None:
+    """It parses a page of trades."""
+    response = market.recent_trades("XBTUSD")
+    trades = response["XXBTZUSD"]
+    assert len(trades) == 1000
+    assert trades.buy.dtype == bool
+    assert response["last"] == (START + 1000) * 10**9
+
+
+def test_candle_store_grows(tmp_path: Path) -> None:
+    """It replaces the last candle in place, without shrinking the files."""
+    store = CandleStore(tmp_path)
+    rows = [candle(START), candle(START + 60)]
+    store.append("XBTUSD", 1, _ohlc_columns(rows), START)
+    column = tmp_path / "XBTUSD" / "1" / "time.bin"
+    size = column.stat().st_size
+    store._commit(column.parent, 1, START)  # Second candle not committed.
+    mapped = store.columns("XBTUSD", 1)["close"]
+    assert store.append("XBTUSD", 1, _ohlc_columns(rows[:1]), START) == 0
+    assert column.stat().st_size == size
+    assert list(mapped) == [40000.0]
+    assert list(store.read("XBTUSD", 1).time) == [START]
@@ -1,8 +1,18 @@
 """Test cases for the __main__ module."""
+import io
+import json
+import subprocess  # nosec
+import sys
+from typing import Any
+
+import httpx
+import pandas as pd
 import pytest
 from click.testing import CliRunner
 
 from okapi import __main__
+from okapi.client import Client
+from okapi.output import FORMATS
 
 
 @pytest.fixture(name="runner")
@@ -15,3 +25,81 @@ def test_main_succeeds(runner: CliRunner) -> None:
     """It exits with a status code of zero."""
     result = runner.invoke(__main__.main)
     assert result.exit_code == 0
+
+
+def test_import_is_lazy() -> None:
+    """It does not import pandas nor NumPy on startup."""
+    result = subprocess.run(  # noqa: S603  # nosec
+        [sys.executable, "-X", "importtime", "-c", "import okapi.__main__"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    modules = {
+        line.rsplit("|", 1)[-1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "okapi" in modules
+    assert not modules & {"pandas", "numpy"}
+
+
+@pytest.fixture(name="mock_client")
+def mock_kraken_client(
+    monkeypatch: pytest.MonkeyPatch, transport: httpx.MockTransport
+) -> None:
+    """Fixture making the commands query a local Kraken stand-in."""
+
+    class MockClient(Client):
+        def __init__(self, **kwargs: Any) -> None:
+            super().__init__(transport=transport, **kwargs)
+
+    monkeypatch.setattr(__main__, "Client", MockClient)
+
+
+def test_ohlc_data_csv(runner: CliRunner, mock_client: None) -> None:
+    """It streams the candles as csv."""
+    result = runner.invoke(__main__.main, ["ohlc-data", "--format", "csv"])
+    assert result.exit_code == 0, result.output
+    header, *rows = result.output.splitlines()
+    assert header == "dtime,time,open,high,low,close,vwap,volume,count,pair"
+    assert len(rows) == 2
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize(
+    "command", ["tradable-asset-pairs", "ticker-information"]
+)
+def test_formats(
+    runner: CliRunner, mock_client: None, command: str, fmt: str
+) -> None:
+    """It writes every table in every format."""
+    if fmt in {"parquet", "arrow"}:
+        pytest.importorskip("pyarrow")
+
+    result = runner.invoke(__main__.main, [command, "--format", fmt])
+    assert result.exit_code == 0, result.output
+    output = result.stdout_bytes
+    if fmt == "csv":
+        frame = pd.read_csv(io.BytesIO(output))
+    elif fmt == "ndjson":
+        frame = pd.read_json(io.BytesIO(output), lines=True)
+    elif fmt == "parquet":
+        import pyarrow.parquet
+
+        frame = pyarrow.parquet.read_table(io.BytesIO(output)).to_pandas()
+    elif fmt == "arrow":
+        import pyarrow.ipc
+
+        frame = pyarrow.ipc.open_stream(output).read_pandas()
+    else:
+        assert b"XXBTZUSD" in output
+        return
+
+    assert list(frame.pair) == ["XXBTZUSD"]
+    if command == "tradable-asset-pairs":
+        fees = frame.fees[0]
+        if isinstance(fees, str):
+            fees = json.loads(fees)
+
+        assert [list(fee) for fee in fees] == [[0, 0.26], [50000, 0.24]]
@@ -0,0 +1,104 @@
+"""Test cases for the metrics module."""
+import httpx
+
+from .conftest import Handler
+from okapi.api.kraken import KrakenRESTAPI
+from okapi.client import Client
+from okapi.metrics import InMemoryMetrics
+from okapi.retry import RetryPolicy
+
+
+def test_public_metrics(kraken_handler: Handler) -> None:
+    """It records latencies, phases, parse time and sizes per endpoint."""
+
+    def traced_handler(request: httpx.Request) -> httpx.Response:
+        """Report a server wait through the trace extension, as httpcore does."""
+        trace = request.extensions["trace"]
+        trace("http11.receive_response_headers.started", {})
+        trace("http11.receive_response_headers.complete", {})
+        return kraken_handler(request)
+
+    metrics = InMemoryMetrics()
+    with Client(
+        transport=httpx.MockTransport(traced_handler), metrics=metrics
+    ) as client:
+        KrakenRESTAPI(client).market.ohlc_data("XBTUSD")
+
+    endpoint = (("endpoint", "OHLC"),)
+    assert metrics.histograms["okapi_request_seconds", endpoint].count == 1
+    assert metrics.histograms["okapi_parse_seconds", endpoint].count == 1
+    wait = (("endpoint", "OHLC"), ("phase", "wait"))
+    assert metrics.histograms["okapi_phase_seconds", wait].count == 1
+    assert metrics.counters["okapi_response_bytes_total", endpoint] > 0
+
+
+def test_parse_metrics(transport: httpx.MockTransport) -> None:
+    """It records the parse time of every public endpoint."""
+    metrics = InMemoryMetrics()
+    with Client(transport=transport, metrics=metrics) as client:
+        market = KrakenRESTAPI(client).market
+        market.server_time()
+        market.system_status()
+        market.asset_info()
+        market.tradable_asset_pairs()
+        market.ticker_information()
+        market.ohlc_data()
+        market.order_book()
+        market.recent_spreads()
+
+    parsed = {
+        dict(labels)["endpoint"]
+        for name, labels in metrics.histograms
+        if name == "okapi_parse_seconds"
+    }
+    assert parsed == {
+        "Time",
+        "SystemStatus",
+        "Assets",
+        "AssetPairs",
+        "Ticker",
+        "OHLC",
+        "Depth",
+        "Spread",
+    }
+
+
+def test_private_metrics(secret: str) -> None:
+    """It counts retries and times signatures."""
+    replies = iter([["EService:Busy"], []])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"error": next(replies), "result": {}})
+
+    metrics = InMemoryMetrics()
+    with Client(
+        key="key",
+        secret=secret,
+        transport=httpx.MockTransport(handler),
+        retry=RetryPolicy(backoff=0.0),
+        metrics=metrics,
+    ) as client:
+        KrakenRESTAPI(client).user.account_balance()
+
+    endpoint = (("endpoint", "Balance"),)
+    assert metrics.counters["okapi_retries_total", endpoint] == 1
+    assert metrics.histograms["okapi_sign_seconds", endpoint].count == 2
+    assert metrics.histograms["okapi_request_seconds", endpoint].count == 2
+
+
+def test_render() -> None:
+    """It renders counters and cumulative histograms for Prometheus."""
+    metrics = InMemoryMetrics(buckets=(0.1, 1.0))
+    metrics.increment("okapi_retries_total", endpoint="OHLC")
+    metrics.observe("okapi_request_seconds", 0.5, endpoint="OHLC")
+    metrics.observe("okapi_request_seconds", 2.0, endpoint="OHLC")
+    assert metrics.render().splitlines() == [
+        "# TYPE okapi_retries_total counter",
+        'okapi_retries_total{endpoint="OHLC"} 1.0',
+        "# TYPE okapi_request_seconds histogram",
+        'okapi_request_seconds_bucket{endpoint="OHLC",le="0.1"} 0',
+        'okapi_request_seconds_bucket{endpoint="OHLC",le="1.0"} 1',
+        'okapi_request_seconds_bucket{endpoint="OHLC",le="+Inf"} 2',
+        'okapi_request_seconds_sum{endpoint="OHLC"} 2.5',
+        'okapi_request_seconds_count{endpoint="OHLC"} 2',
+    ]
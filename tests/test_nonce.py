@@ -0,0 +1,75 @@
+"""Test cases for the nonce module."""
+import multiprocessing
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from okapi.nonce import EpochNonce
+from okapi.nonce import FileLockNonce
+from okapi.nonce import SharedMemoryNonce
+
+
+def _draw(path: Path) -> list[int]:
+    provider = FileLockNonce(path)
+    try:
+        return [provider() for _ in range(200)]
+    finally:
+        provider.close()
+
+
+def _draw_forked(provider: FileLockNonce, barrier: Any, queue: Any) -> None:
+    barrier.wait()
+    queue.put([provider() for _ in range(1000)])
+
+
+def test_epoch_nonce_is_strictly_increasing() -> None:
+    """It never repeats a value and starts at the epoch clock."""
+    provider = EpochNonce()
+    start = time.time_ns()
+    values = [provider() for _ in range(1000)]
+    assert values[0] >= start
+    assert all(a < b for a, b in zip(values, values[1:]))
+
+
+def test_shared_memory_nonce() -> None:
+    """It keeps increasing across calls."""
+    provider = SharedMemoryNonce()
+    assert provider() < provider()
+
+
+def test_file_lock_nonce_across_processes(tmp_path: Path) -> None:
+    """It never issues the same nonce to two processes."""
+    path = tmp_path / "nonce"
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        draws = pool.map(_draw, [path] * 4)
+
+    values = [value for draw in draws for value in draw]
+    assert len(set(values)) == len(values)
+    assert all(a < b for draw in draws for a, b in zip(draw, draw[1:]))
+
+
+def test_file_lock_nonce_after_fork(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """It never issues the same nonce to processes forked after creation."""
+    monkeypatch.setattr(time, "time_ns", lambda: 0)
+    provider = FileLockNonce(tmp_path / "nonce")
+    provider()
+    context = multiprocessing.get_context("fork")
+    barrier, queue = context.Barrier(4), context.SimpleQueue()
+    processes = [
+        context.Process(target=_draw_forked, args=(provider, barrier, queue))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+
+    draws = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    provider.close()
+    values = [value for draw in draws for value in draw]
+    assert sorted(values) == list(range(2, 4002))
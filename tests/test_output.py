@@ -0,0 +1,64 @@
+"""Test cases for the output module."""
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from okapi.output import FrameWriter
+
+
+FRAME = pd.DataFrame(
+    {
+        "time": pd.to_datetime([1650000000, 1650000060, 1650000120], unit="s"),
+        "close": [1.5, 2.5, 3.5],
+        "count": [1, 2, 3],
+    }
+)
+
+
+def test_csv_batches() -> None:
+    """It writes the header once across frames and batches."""
+    out = io.BytesIO()
+    with FrameWriter(out, "csv", batch_size=2) as writer:
+        writer.write(FRAME)
+        writer.write(FRAME)
+
+    lines = out.getvalue().decode().splitlines()
+    assert lines[0] == "time,close,count"
+    assert len(lines) == 7
+    assert writer.rows == 6
+
+
+def test_ndjson() -> None:
+    """It writes one JSON object per row."""
+    out = io.BytesIO()
+    with FrameWriter(out, "ndjson", batch_size=2) as writer:
+        writer.write(FRAME)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [record["count"] for record in records] == [1, 2, 3]
+    assert records[0]["time"].startswith("2022-04-15T05:20:00")
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_arrow_formats(fmt: str) -> None:
+    """It streams batches that pyarrow reads back as one table."""
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    out = io.BytesIO()
+    with FrameWriter(out, fmt, batch_size=2) as writer:
+        writer.write(FRAME)
+        writer.write(FRAME)
+
+    source = pyarrow.BufferReader(out.getvalue())
+    table = (
+        pyarrow.parquet.read_table(source)
+        if fmt == "parquet"
+        else pyarrow.ipc.open_stream(source).read_all()
+    )
+    pd.testing.assert_frame_equal(
+        table.to_pandas(), pd.concat([FRAME, FRAME], ignore_index=True)
+    )
@@ -0,0 +1,47 @@
+"""Test cases for the ratelimit module."""
+import time
+
+import httpx
+import pytest
+
+from okapi.client import Client
+from okapi.ratelimit import CallCounter
+from okapi.ratelimit import RateLimiter
+
+
+def test_counter_queues_calls_over_budget() -> None:
+    """It delays calls past the maximum in booking order."""
+    counter = CallCounter(maximum=2.0, decay=1.0)
+    delays = [counter.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(1.0, abs=0.01)
+    assert delays[3] == pytest.approx(2.0, abs=0.01)
+
+
+def test_limiter_costs_per_endpoint() -> None:
+    """It charges private endpoints to the private counter."""
+    limiter = RateLimiter(tier="pro")
+    ledgers = httpx.Request("POST", "https://api.kraken.com/0/private/Ledgers")
+    order = httpx.Request("POST", "https://api.kraken.com/0/private/AddOrder")
+    limiter.acquire(ledgers)
+    limiter.acquire(order)
+    assert limiter.private.counter == pytest.approx(2.0, abs=0.01)
+    assert limiter.public.counter == 0.0
+
+
+def test_invalid_tier() -> None:
+    """It rejects unknown verification tiers."""
+    with pytest.raises(ValueError):
+        RateLimiter(tier="whale")
+
+
+def test_client_paces_requests() -> None:
+    """It spaces public requests according to the public budget."""
+    limiter = RateLimiter(public=CallCounter(maximum=1.0, decay=20.0))
+    transport = httpx.MockTransport(lambda _: httpx.Response(200, json={}))
+    with Client(limiter=limiter, transport=transport) as client:
+        start = time.monotonic()
+        for _ in range(3):
+            client.get("public/Time")
+
+    assert time.monotonic() - start >= 0.09
@@ -0,0 +1,67 @@
+"""Test cases for the resample module."""
+import numpy as np
+import pytest
+
+from okapi.api.history import Columns
+from okapi.resample import OHLCResampler
+from okapi.resample import resample_ohlc
+
+
+START = 1650000000 - 1650000000 % 3600
+
+
+def candles(count: int) -> Columns:
+    """Build one-minute candles with a deterministic random walk."""
+    rng = np.random.default_rng(0)
+    close = 40000 + np.cumsum(rng.normal(size=count))
+    volume = rng.uniform(0, 2, size=count)
+    volume[::7] = 0
+    return {
+        "time": START + 60 * np.arange(count, dtype=np.int64),
+        "open": close - 1,
+        "high": close + 2,
+        "low": close - 3,
+        "close": close,
+        "vwap": close - 0.5,
+        "volume": volume,
+        "count": rng.integers(0, 10, size=count),
+    }
+
+
+def test_resample_ohlc() -> None:
+    """It combines each bucket of base candles."""
+    columns = candles(10)
+    resampled = resample_ohlc(columns, interval=3)
+    assert list(resampled["time"]) == [START + 180 * i for i in range(4)]
+    assert resampled["open"][1] == columns["open"][3]
+    assert resampled["close"][1] == columns["close"][5]
+    assert resampled["high"][1] == columns["high"][3:6].max()
+    assert resampled["low"][1] == columns["low"][3:6].min()
+    assert resampled["count"][3] == columns["count"][9]
+    volume = columns["volume"][3:6]
+    assert resampled["vwap"][1] == pytest.approx(
+        (columns["vwap"][3:6] * volume).sum() / volume.sum()
+    )
+
+
+def test_resample_rejects_other_intervals() -> None:
+    """It only builds multiples of the base interval."""
+    with pytest.raises(ValueError):
+        resample_ohlc(candles(10), base=5, interval=12)
+
+
+def test_incremental_matches_batch() -> None:
+    """It emits the same buckets as a batch resampling."""
+    columns = candles(300)
+    resampler = OHLCResampler(interval=120)
+    emitted = []
+    for start in range(0, 300, 7):
+        stop = min(start + 8, 300)
+        page = {name: column[start:stop] for name, column in columns.items()}
+        emitted.append(resampler.update(page))
+
+    batch = resample_ohlc(columns, interval=120)
+    for name, column in batch.items():
+        incremental = np.concatenate([part[name] for part in emitted])
+        current = resampler.current()[name]
+        assert np.allclose(np.r_[incremental, current], column)
@@ -0,0 +1,99 @@
+"""Test cases for the retry module."""
+import urllib.parse
+
+import httpx
+import pytest
+
+from okapi.api.kraken import KrakenRESTAPI
+from okapi.api.utils import content
+from okapi.client import Client
+from okapi.exception import KrakenInvalidArgumentsError
+from okapi.exception import KrakenRateLimitError
+from okapi.exception import KrakenRetryableError
+from okapi.retry import RetryPolicy
+
+
+def _handler(
+    *replies: tuple[int, list[str]]
+) -> tuple[list, httpx.MockTransport]:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, errors = replies[min(len(requests), len(replies) - 1)]
+        requests.append(request)
+        return httpx.Response(status, json={"error": errors, "result": {}})
+
+    return requests, httpx.MockTransport(handler)
+
+
+def test_retries_transient_errors(secret: str) -> None:
+    """It retries private calls with a fresh nonce and signature."""
+    requests, transport = _handler(
+        (200, ["EService:Unavailable"]), (502, []), (200, [])
+    )
+    with Client(
+        key="key",
+        secret=secret,
+        transport=transport,
+        retry=RetryPolicy(backoff=0.0),
+    ) as client:
+        response = KrakenRESTAPI(client).user.trade_balance()
+
+    assert content(response) == {}
+    nonces = [
+        urllib.parse.parse_qs(request.content.decode())["nonce"][0]
+        for request in requests
+    ]
+    signatures = [request.headers["API-Sign"] for request in requests]
+    assert len(requests) == 3
+    assert len(set(nonces)) == len(set(signatures)) == 3
+    assert [request.extensions["nonce"] for request in requests] == nonces
+
+
+@pytest.mark.parametrize(
+    "policy,path,reply,calls",
+    [
+        (RetryPolicy(backoff=0.0), "public/Time", (400, []), 1),
+        (RetryPolicy(backoff=0.0), "private/AddOrder", (502, []), 1),
+        (
+            RetryPolicy(backoff=0.0),
+            "private/AddOrder",
+            (200, ["EAPI:Rate limit exceeded"]),
+            5,
+        ),
+        (
+            RetryPolicy(backoff=0.0),
+            "public/Time",
+            (200, ["EGeneral:Invalid arguments"]),
+            1,
+        ),
+        (
+            RetryPolicy(backoff=1.0, deadline=0.0),
+            "public/Time",
+            (503, []),
+            1,
+        ),
+    ],
+)
+def test_gives_up(
+    policy: RetryPolicy, path: str, reply: tuple[int, list[str]], calls: int
+) -> None:
+    """It does not retry fatal or unsafe failures, nor past limits."""
+    requests, transport = _handler(reply)
+    with Client(transport=transport, retry=policy) as client:
+        client.post(path, data={"nonce": "1"}, extensions={"nonce": "1"})
+
+    assert len(requests) == calls
+
+
+def test_error_classes() -> None:
+    """It raises the exception class matching the Kraken error."""
+    request = httpx.Request("GET", "https://api.kraken.com/0/public/Time")
+    for errors, error_class in (
+        (["EAPI:Rate limit exceeded"], KrakenRateLimitError),
+        (["EService:Busy"], KrakenRetryableError),
+        (["EGeneral:Invalid arguments:pair"], KrakenInvalidArgumentsError),
+    ):
+        response = httpx.Response(200, json={"error": errors}, request=request)
+        with pytest.raises(error_class):
+            content(response)
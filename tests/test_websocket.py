@@ -0,0 +1,155 @@
+"""Test cases for the websocket module."""
+import asyncio
+import json
+import zlib
+from typing import Any
+
+import pytest
+
+from okapi.websocket import BookUpdate
+from okapi.websocket import KrakenWebSocket
+from okapi.websocket import OHLCUpdate
+from okapi.websocket import OrderBook
+from okapi.websocket import TradeUpdate
+
+websockets = pytest.importorskip("websockets")
+
+
+def crc(asks: list[tuple[str, str]], bids: list[tuple[str, str]]) -> str:
+    """Compute the Kraken checksum of the given top levels."""
+    message = "".join(
+        price.replace(".", "").lstrip("0")
+        + volume.replace(".", "").lstrip("0")
+        for price, volume in asks + bids
+    )
+    return str(zlib.crc32(message.encode()))
+
+
+SNAPSHOT = [
+    0,
+    {
+        "as": [
+            ["5541.30000", "2.50700000", "1534614248.123678"],
+            ["5541.80000", "0.33000000", "1534614098.345543"],
+            ["5542.70000", "0.64700000", "1534614244.654432"],
+        ],
+        "bs": [
+            ["5541.20000", "1.52900000", "1534614248.765567"],
+            ["5539.90000", "0.30000000", "1534614241.769870"],
+            ["5539.50000", "5.00000000", "1534613831.243486"],
+        ],
+    },
+    "book-3",
+    "XBT/USD",
+]
+UPDATE = [
+    0,
+    {"a": [["5541.30000", "0.00000000", "1534614335.345903"]]},
+    {
+        "b": [["5541.25000", "1.00000000", "1534614335.345903"]],
+        "c": crc(
+            [
+                ("5541.80000", "0.33000000"),
+                ("5542.70000", "0.64700000"),
+            ],
+            [
+                ("5541.25000", "1.00000000"),
+                ("5541.20000", "1.52900000"),
+                ("5539.90000", "0.30000000"),
+            ],
+        ),
+    },
+    "book-3",
+    "XBT/USD",
+]
+BAD_UPDATE = [
+    0,
+    {"a": [["5543.0", "1.0", "0"]], "c": "1"},
+    "book-3",
+    "XBT/USD",
+]
+TRADE = [
+    1,
+    [["5541.2", "0.15", "1534614057.321597", "s", "l", ""]],
+    "trade",
+    "XBT/USD",
+]
+OHLC = [
+    2,
+    [
+        "1542057314.7",
+        "1542057360.0",
+        "3586.7",
+        "3586.7",
+        "3586.6",
+        "3586.6",
+        "3586.68",
+        "0.03",
+        8,
+    ],
+    "ohlc-5",
+    "XBT/USD",
+]
+
+
+def test_order_book_updates() -> None:
+    """It applies updates, keeps the depth and matches the checksum."""
+    book = OrderBook("XBT/USD", depth=3)
+    book.apply_snapshot(SNAPSHOT[1]["as"], SNAPSHOT[1]["bs"])
+    book.apply_update(UPDATE[1]["a"], UPDATE[2]["b"])
+    book.validate(UPDATE[2]["c"])
+    assert book.asks.best(1) == [("5541.80000", "0.33000000")]
+    assert [price for price, _ in book.bids.best()] == [
+        "5541.25000",
+        "5541.20000",
+        "5539.90000",
+    ]
+
+
+def test_stream_replays_frames() -> None:
+    """It streams updates and resubscribes on a checksum mismatch."""
+    frames = [
+        {"event": "systemStatus", "status": "online"},
+        SNAPSHOT,
+        UPDATE,
+        TRADE,
+        OHLC,
+        BAD_UPDATE,
+    ]
+    received: list[Any] = []
+
+    async def replay(connection: Any) -> None:
+        received.append(json.loads(await connection.recv()))
+        for frame in frames:
+            await connection.send(json.dumps(frame))
+
+        received.append(json.loads(await connection.recv()))
+        received.append(json.loads(await connection.recv()))
+
+    async def stream() -> tuple[list[Any], int]:
+        async with websockets.serve(replay, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            updates = []
+            async with KrakenWebSocket(
+                f"ws://127.0.0.1:{port}", depth=3
+            ) as ws:
+                await ws.subscribe("book", ["XBT/USD"])
+                async for update in ws:
+                    updates.append(update)
+
+                return updates, ws.checksum_errors
+
+    updates, checksum_errors = asyncio.run(stream())
+    assert [type(update) for update in updates] == [
+        BookUpdate,
+        BookUpdate,
+        TradeUpdate,
+        OHLCUpdate,
+    ]
+    assert updates[3].interval == 5
+    assert received[0]["subscription"] == {"name": "book", "depth": 3}
+    assert checksum_errors == 1
+    assert [message["event"] for message in received[1:]] == [
+        "unsubscribe",
+        "subscribe",
+    ]